@@ -0,0 +1,76 @@
+# loadtest.py
+"""Load test for `text-compressor serve`: requests/second and latency.
+
+Starts a daemon on a temporary socket, then hammers it with bytes‑mode
+compress requests built from the samples corpus:
+
+    python loadtest.py [--clients 8] [--seconds 10] [--workers N]
+"""
+from __future__ import annotations
+
+import argparse
+import pathlib
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+
+from text_compressor.client import Client
+
+parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+parser.add_argument("--clients", type=int, default=8)
+parser.add_argument("--seconds", type=float, default=10.0)
+parser.add_argument("--workers", type=int, default=None)
+parser.add_argument("--algo", default="huffman", choices=["rle", "huffman"])
+args = parser.parse_args()
+
+payloads = [p.read_bytes() for p in sorted(pathlib.Path("samples").glob("*.txt"))]
+sock = pathlib.Path(tempfile.mkdtemp()) / "load.sock"
+
+cmd = [sys.executable, "-m", "text_compressor.cli", "serve", "--socket", str(sock)]
+if args.workers:
+    cmd += ["--workers", str(args.workers)]
+daemon = subprocess.Popen(cmd)
+
+try:
+    deadline = time.monotonic() + 30
+    while (client := Client.connect(sock)) is None:
+        if time.monotonic() > deadline or daemon.poll() is not None:
+            sys.exit("daemon did not start")
+        time.sleep(0.05)
+    client.close()
+
+    latencies: list[float] = []
+    lock = threading.Lock()
+    stop_at = time.monotonic() + args.seconds
+
+    def worker(offset: int) -> None:
+        local = []
+        with Client.connect(sock) as c:
+            i = offset
+            while time.monotonic() < stop_at:
+                t0 = time.perf_counter()
+                c.compress_bytes(payloads[i % len(payloads)], args.algo)
+                local.append(time.perf_counter() - t0)
+                i += 1
+        with lock:
+            latencies.extend(local)
+
+    threads = [threading.Thread(target=worker, args=(n,)) for n in range(args.clients)]
+    t0 = time.perf_counter()
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    wall = time.perf_counter() - t0
+
+    latencies.sort()
+    n = len(latencies)
+    print(f"clients {args.clients}  algo {args.algo}  requests {n}  wall {wall:.1f}s")
+    print(f"throughput  {n / wall:10.1f} req/s")
+    for label, q in (("p50", 0.50), ("p90", 0.90), ("p99", 0.99)):
+        print(f"latency {label} {latencies[min(n - 1, int(q * n))] * 1000:10.2f} ms")
+finally:
+    daemon.terminate()
+    daemon.wait()
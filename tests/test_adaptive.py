@@ -0,0 +1,122 @@
+# tests/test_adaptive.py
+"""Pytest suite for the adaptive (FGK) Huffman codec."""
+import io
+import os
+import random
+import threading
+import time
+
+import pytest
+
+from text_compressor.algorithms.adaptive import (
+    AdaptiveDecoder,
+    AdaptiveEncoder,
+    compress_stream,
+    decode,
+    encode,
+    verify,
+)
+from text_compressor.utils.blocks import CorruptArchiveError
+
+
+@pytest.mark.parametrize(
+    "text",
+    [
+        "",  # empty
+        "A",  # single char
+        "The quick brown fox jumps over the lazy dog",  # pangram
+        "😀" * 100,  # unicode emoji
+        "ABABABABABABABABABABABAB",  # repetitive pattern
+    ],
+)
+def test_roundtrip(text):
+    assert decode(encode(text)) == text
+
+
+def test_random_bytes_fed_one_byte_at_a_time():
+    for _ in range(20):
+        data = bytes(random.randint(0, 255) for _ in range(random.randint(0, 3000)))
+        enc = AdaptiveEncoder()
+        blob = enc.update(data) + enc.finish()
+        dec = AdaptiveDecoder()
+        out = b"".join(dec.feed(blob[i : i + 1]) for i in range(len(blob)))
+        dec.close()
+        assert out == data
+
+
+def test_output_emitted_before_finish():
+    enc = AdaptiveEncoder()
+    assert len(enc.update(b"streaming log line\n" * 20)) > 0
+
+
+def test_members_concatenate_and_corruption_is_detected():
+    blob = encode("first\n") + encode("second\n")
+    assert decode(blob) == "first\nsecond\n"
+    assert verify(io.BytesIO(blob)) == (2, len("first\nsecond\n"))
+
+    bad = bytearray(blob)
+    bad[-1] ^= 0xFF  # CRC of the second member
+    with pytest.raises(CorruptArchiveError) as exc:
+        verify(io.BytesIO(bytes(bad)))
+    assert exc.value.offset == len(encode("first\n"))
+
+    with pytest.raises(CorruptArchiveError):
+        verify(io.BytesIO(blob[:-2]))  # truncated
+
+
+class _Trickle(io.BytesIO):
+    """A pipe‑like source that returns at most 100 bytes per read."""
+
+    def read1(self, n=-1):
+        return super().read1(100)
+
+
+def test_stream_closes_members_at_byte_limit():
+    data = b"line of text\n" * 1000
+    out = io.BytesIO()
+    raw, comp = compress_stream(_Trickle(data), out, member_bytes=1000)
+    assert (raw, comp) == (len(data), len(out.getvalue()))
+    members, size = verify(io.BytesIO(out.getvalue()))
+    assert members == 13 and size == len(data)
+
+
+def test_interrupted_stream_finishes_open_member():
+    class Interrupted(io.BytesIO):
+        def read1(self, n=-1):
+            chunk = super().read1(n)
+            if not chunk:
+                raise KeyboardInterrupt
+            return chunk
+
+    out = io.BytesIO()
+    with pytest.raises(KeyboardInterrupt):
+        compress_stream(Interrupted(b"no EOF here\nlast line"), out)
+    assert decode(out.getvalue()) == "no EOF here\nlast line"
+
+
+def test_quiet_pipe_member_closes_after_timeout():
+    r, w = os.pipe()
+    out = io.BytesIO()
+    with open(r, "rb") as src:
+        thread = threading.Thread(
+            target=compress_stream, args=(src, out), kwargs={"member_seconds": 0.1}
+        )
+        thread.start()
+        os.write(w, b"first line\n")
+        deadline = time.monotonic() + 10
+        while not _complete(out.getvalue()):
+            assert time.monotonic() < deadline, "member not closed while idle"
+            time.sleep(0.05)
+        os.close(w)
+        thread.join()
+    assert decode(out.getvalue()) == "first line\n"
+
+
+def _complete(blob: bytes) -> bool:
+    if not blob:
+        return False
+    try:
+        verify(io.BytesIO(blob))
+    except CorruptArchiveError:
+        return False
+    return True
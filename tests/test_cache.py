@@ -0,0 +1,60 @@
+# tests/test_cache.py
+"""Pytest suite for the on‑disk ResultCache."""
+import os
+
+from text_compressor import cache as cache_module
+from text_compressor.cache import ResultCache
+from text_compressor.compressors import CompressorFactory
+
+
+def test_cache_hit_skips_encode(tmp_path):
+    src = tmp_path / "in.txt"
+    src.write_text("cache me " * 500, encoding="utf-8")
+    cache = ResultCache(tmp_path / "cache")
+    comp = CompressorFactory.get("huffman", cache=cache)
+
+    first = comp.compress(src, tmp_path / "a.huff")
+    second = comp.compress(src, tmp_path / "b.huff")
+    assert not first.cache_hit
+    assert second.cache_hit
+    assert (tmp_path / "a.huff").read_bytes() == (tmp_path / "b.huff").read_bytes()
+
+    # The key covers the algorithm, so RLE does not hit the Huffman entry.
+    rle = CompressorFactory.get("rle", cache=cache)
+    assert not rle.compress(src, tmp_path / "c.rle").cache_hit
+
+
+def test_format_version_invalidates_keys(monkeypatch):
+    before = ResultCache.key(b"data", "huffman")
+    monkeypatch.setattr(cache_module, "FORMAT_VERSION", cache_module.FORMAT_VERSION + 1)
+    assert ResultCache.key(b"data", "huffman") != before
+
+
+def test_lru_eviction(tmp_path):
+    cache = ResultCache(tmp_path, max_bytes=350)
+    for i, name in enumerate(["a", "b", "c"]):
+        cache.put(name, b"x" * 100)
+        os.utime(tmp_path / f"{name}.bin", (i, i))
+    cache.get("a")  # refresh "a" so "b" is now the oldest
+    cache.put("d", b"x" * 100)
+
+    assert cache.get("b") is None
+    assert cache.get("a") is not None
+    assert cache.get("c") is not None
+    assert cache.get("d") is not None
+
+
+def test_put_scans_only_near_the_limit(tmp_path, monkeypatch):
+    cache = ResultCache(tmp_path, max_bytes=1000)
+    cache.put("first", b"x" * 100)  # no index yet: one scan
+    scans = []
+    evict = ResultCache._evict
+    monkeypatch.setattr(
+        ResultCache, "_evict", lambda self: scans.append(1) or evict(self)
+    )
+    for i in range(9):
+        cache.put(str(i), b"x" * 100)
+    assert scans == []
+    cache.put("over", b"x" * 100)  # 1000 + 100 bytes: must evict
+    assert scans == [1]
+    assert sum(p.stat().st_size for p in tmp_path.glob("*.bin")) <= 1000
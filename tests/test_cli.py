@@ -4,12 +4,20 @@
 """Integration tests invoking CLI as a subprocess."""
 from __future__ import annotations
 
+import os
+import signal
+import socket
 import subprocess
 import sys
+import threading
+import time
 from pathlib import Path
 
 import pytest
 
+from text_compressor.cache import FORMAT_VERSION
+from text_compressor.client import PROTOCOL_VERSION, _recv, _send
+
 ROOT = Path(__file__).resolve().parents[1]
 CLI = [sys.executable, "-m", "text_compressor.cli"]
 
@@ -33,3 +41,282 @@ def test_cli_roundtrip(sample, tmp_path):
     _run(["decompress", str(comp), str(decomp)])
 
     assert decomp.read_text() == sample.read_text()
+
+
+def test_cli_empty_input(tmp_path):
+    empty = tmp_path / "empty.txt"
+    empty.touch()
+    for algo in ("huffman", "rle"):
+        comp = tmp_path / f"empty.{algo}"
+        back = tmp_path / f"back.{algo}.txt"
+        _run(["compress", str(empty), str(comp), "-a", algo, "--no-daemon", "-v"])
+        assert "OK" in _run(["test", str(comp)]).stdout
+        _run(["decompress", str(comp), str(back), "--no-daemon"])
+        assert back.read_bytes() == b""
+
+
+def test_cli_test_command(sample, tmp_path):
+    comp = tmp_path / "out.huff"
+    _run(["compress", str(sample), str(comp)])
+    assert "OK" in _run(["test", str(comp)]).stdout
+
+    buf = bytearray(comp.read_bytes())
+    buf[-1] ^= 0xFF
+    comp.write_bytes(bytes(buf))
+    res = subprocess.run(CLI + ["test", str(comp)], capture_output=True, text=True)
+    assert res.returncode == 3
+    assert "offset 5" in res.stderr
+
+
+def test_cli_reports_errors_in_process(sample, tmp_path):
+    comp = tmp_path / "out.huff"
+    _run(["compress", str(sample), str(comp), "--no-daemon"])
+    buf = bytearray(comp.read_bytes())
+    buf[-1] ^= 0xFF
+    comp.write_bytes(bytes(buf))
+    binary = tmp_path / "bin.txt"
+    binary.write_bytes(b"ab\xffcd")
+    for args in (
+        ["decompress", str(comp), str(tmp_path / "back.txt")],
+        ["compress", str(binary), str(tmp_path / "bin.huff")],
+    ):
+        res = subprocess.run(
+            CLI + args + ["--no-daemon"], capture_output=True, text=True
+        )
+        assert res.returncode == 2
+        assert res.stderr.startswith("Error:")
+
+
+def test_cli_append(tmp_path):
+    part1 = tmp_path / "a.txt"
+    part2 = tmp_path / "b.txt"
+    part1.write_text("day one\n")
+    part2.write_text("day two\n")
+    arc = tmp_path / "log.rle"
+    back = tmp_path / "back.txt"
+
+    _run(["compress", str(part1), str(arc), "--algo", "rle"])
+    _run(["compress", str(part2), str(arc), "--append"])
+    _run(["decompress", str(arc), str(back)])
+    assert back.read_text() == "day one\nday two\n"
+
+    res = subprocess.run(
+        CLI + ["compress", str(part2), str(arc), "--append", "--algo", "huffman"],
+        capture_output=True,
+        text=True,
+    )
+    assert res.returncode == 1
+
+    empty = tmp_path / "empty.rle"
+    empty.touch()
+    _run(["compress", str(part1), str(empty), "--append", "--algo", "rle"])
+    assert empty.read_bytes()[:4] == b"RLE1"
+    _run(["test", str(empty)])
+
+
+def test_cli_adaptive_pipe():
+    text = "streamed through a pipe\n" * 50
+    comp = subprocess.run(
+        CLI + ["compress", "-a", "adaptive", "-", "-"],
+        input=text.encode(),
+        capture_output=True,
+        check=True,
+    ).stdout
+    back = subprocess.run(
+        CLI + ["decompress", "-", "-"], input=comp, capture_output=True, check=True
+    ).stdout
+    assert back.decode() == text
+
+    res = subprocess.run(
+        CLI + ["compress", "--no-daemon", "-", "-"],
+        input=b"ab\xffcd",
+        capture_output=True,
+    )
+    assert res.returncode == 2
+    assert res.stderr.startswith(b"Error:")
+
+
+@pytest.mark.skipif(not hasattr(signal, "SIGINT"), reason="no signals")
+@pytest.mark.parametrize("signum", [signal.SIGINT, signal.SIGTERM])
+def test_cli_adaptive_pipe_interrupted(tmp_path, signum):
+    arc = tmp_path / "app.ahf"
+    back = tmp_path / "back.txt"
+    text = "".join(f"log line {i}\n" for i in range(3))
+    proc = subprocess.Popen(
+        CLI + ["compress", "-a", "adaptive", "-", str(arc)],
+        stdin=subprocess.PIPE,
+        stderr=subprocess.PIPE,
+    )
+    proc.stdin.write(text.encode())
+    proc.stdin.flush()
+    deadline = time.monotonic() + 10
+    while not (arc.exists() and arc.stat().st_size > 5):
+        assert time.monotonic() < deadline, "no output before the interrupt"
+        time.sleep(0.05)
+    proc.send_signal(signum)
+    proc.wait(timeout=10)
+    proc.stdin.close()
+    proc.stderr.close()
+    assert proc.returncode == 128 + signum
+
+    _run(["test", str(arc)])
+    _run(["decompress", str(arc), str(back)])
+    assert back.read_text() == text
+
+
+def test_cli_pipe_append(tmp_path):
+    arc = tmp_path / "log.ahf"
+    for part in ("first\n", "second\n"):
+        subprocess.run(
+            CLI + ["compress", "-a", "adaptive", "--append", "-", str(arc)],
+            input=part.encode(),
+            check=True,
+        )
+    back = subprocess.run(
+        CLI + ["decompress", str(arc), "-"], capture_output=True, check=True
+    ).stdout
+    assert back == b"first\nsecond\n"
+
+    huff = tmp_path / "log.huff"
+    huff.write_bytes(
+        subprocess.run(
+            CLI + ["compress", "-", "-"], input=b"x\n", capture_output=True, check=True
+        ).stdout
+    )
+    for args in (["--append", "-", str(huff)], ["--append", "-", "-"]):
+        res = subprocess.run(
+            CLI + ["compress", *args], input=b"y\n", capture_output=True
+        )
+        assert res.returncode == 1
+        assert b"append" in res.stderr
+
+
+def test_cli_huffman_unicode_append(tmp_path):
+    part1 = tmp_path / "a.txt"
+    part2 = tmp_path / "b.txt"
+    part1.write_text("日本語のテキスト\n", encoding="utf-8")
+    part2.write_text("中文文本\n", encoding="utf-8")
+    arc = tmp_path / "out.huff"
+    back = tmp_path / "back.txt"
+
+    _run(["compress", str(part1), str(arc), "--algo", "huffman"])
+    _run(["compress", str(part2), str(arc), "--append", "--algo", "huffman-unicode"])
+    _run(["test", str(arc)])
+    _run(["decompress", str(arc), str(back)])
+    assert back.read_text(encoding="utf-8") == "日本語のテキスト\n中文文本\n"
+
+
+@pytest.mark.skipif(not hasattr(socket, "AF_UNIX"), reason="no Unix sockets")
+def test_cli_falls_back_when_daemon_drops(sample, tmp_path):
+    sock = tmp_path / "broken.sock"
+    listener = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    listener.bind(str(sock))
+    listener.listen(8)
+    stop = threading.Event()
+
+    def drop_connections():
+        while not stop.is_set():
+            try:
+                listener.accept()[0].close()
+            except OSError:
+                return
+
+    thread = threading.Thread(target=drop_connections)
+    thread.start()
+    env = {**os.environ, "TEXT_COMPRESSOR_SOCKET": str(sock)}
+    comp = tmp_path / "out.huff"
+    back = tmp_path / "back.txt"
+    try:
+        for args in (
+            ["compress", str(sample), str(comp)],
+            ["decompress", str(comp), str(back)],
+        ):
+            res = subprocess.run(CLI + args, capture_output=True, text=True, env=env)
+            assert res.returncode == 0, res.stderr
+            assert "in‑process" in res.stderr
+    finally:
+        stop.set()
+        listener.shutdown(socket.SHUT_RDWR)
+        listener.close()
+        thread.join()
+    assert back.read_text() == sample.read_text()
+
+
+@pytest.mark.skipif(not hasattr(socket, "AF_UNIX"), reason="no Unix sockets")
+def test_cli_append_not_retried_when_daemon_drops(tmp_path):
+    part = tmp_path / "a.txt"
+    part.write_text("first\n", encoding="utf-8")
+    arc = tmp_path / "log.huff"
+    _run(["compress", str(part), str(arc), "--no-daemon"])
+    size = arc.stat().st_size
+
+    sock = tmp_path / "drop.sock"
+    listener = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    listener.bind(str(sock))
+    listener.listen(1)
+
+    def answer_ping_then_drop():
+        conn = listener.accept()[0]
+        with conn:
+            _recv(conn)
+            _send(
+                conn,
+                {"ok": True, "protocol": PROTOCOL_VERSION, "format": FORMAT_VERSION},
+            )
+            _recv(conn)  # the append request – dropped unanswered
+
+    thread = threading.Thread(target=answer_ping_then_drop)
+    thread.start()
+    env = {**os.environ, "TEXT_COMPRESSOR_SOCKET": str(sock)}
+    try:
+        res = subprocess.run(
+            CLI + ["compress", str(part), str(arc), "--append"],
+            capture_output=True,
+            text=True,
+            env=env,
+        )
+    finally:
+        thread.join()
+        listener.close()
+    assert res.returncode == 2
+    assert "text-compressor test" in res.stderr
+    assert arc.stat().st_size == size
+
+
+@pytest.mark.skipif(not hasattr(socket, "AF_UNIX"), reason="no Unix sockets")
+def test_cli_skips_daemon_of_another_version(sample, tmp_path):
+    sock = tmp_path / "old.sock"
+    listener = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    listener.bind(str(sock))
+    listener.listen(1)
+
+    def old_daemon():  # answers ping without versions, rejects everything else
+        conn = listener.accept()[0]
+        with conn:
+            while True:
+                try:
+                    header, _ = _recv(conn)
+                except EOFError:
+                    return
+                if header["op"] == "ping":
+                    _send(conn, {"ok": True})
+                else:
+                    _send(conn, {"ok": False, "error": "Unknown op"})
+
+    thread = threading.Thread(target=old_daemon)
+    thread.start()
+    env = {**os.environ, "TEXT_COMPRESSOR_SOCKET": str(sock)}
+    comp = tmp_path / "out.huff"
+    try:
+        res = subprocess.run(
+            CLI + ["compress", str(sample), str(comp), "-a", "huffman-unicode"],
+            capture_output=True,
+            text=True,
+            env=env,
+        )
+    finally:
+        thread.join()
+        listener.close()
+    assert res.returncode == 0, res.stderr
+    assert "in‑process" in res.stderr
+    assert comp.exists()
@@ -1,10 +1,13 @@
 # tests/test_huffman.py
 """Pytest suite for Huffman codec."""
+import io
 import random
+from pathlib import Path
 
 import pytest
 
-from text_compressor.algorithms.huffman import decode, encode
+from text_compressor.algorithms.huffman import append, decode, encode, verify
+from text_compressor.utils.blocks import BLOCK_HEADER_SIZE, CorruptArchiveError
 
 
 @pytest.mark.parametrize(
@@ -26,3 +29,78 @@ def test_random_strings():
         length = random.randint(1, 500)
         s = "".join(chr(random.randint(32, 126)) for _ in range(length))
         assert decode(encode(s)) == s
+
+
+def test_multi_block_roundtrip():
+    text = "".join(f"line {i}\n" for i in range(20000))
+    assert decode(encode(text)) == text
+
+
+def test_v1_archive_still_decodes():
+    root = Path(__file__).resolve().parents[1]
+    assert decode((root / "samples" / "lorem.huff").read_bytes()) == (
+        root / "samples" / "lorem.txt"
+    ).read_text(encoding="utf-8")
+
+
+def test_verify_reports_first_bad_block():
+    text = "".join(f"line {i}\n" for i in range(20000))
+    buf = bytearray(encode(text))
+    assert verify(io.BytesIO(bytes(buf)))[1] == len(text)
+
+    # Damage the encoded bits in the middle of the first block.
+    first_len = int.from_bytes(buf[9:13], "big")
+    buf[5 + BLOCK_HEADER_SIZE + first_len // 2] ^= 0xFF
+    with pytest.raises(CorruptArchiveError) as exc:
+        verify(io.BytesIO(bytes(buf)))
+    assert exc.value.offset == 5
+
+
+def test_append_adds_blocks_without_rewriting():
+    buf = io.BytesIO(encode("first part\n"))
+    before = buf.getvalue()
+    added = append(buf, "second part\n".encode("utf-8"))
+    after = buf.getvalue()
+    assert after[: len(before)] == before
+    assert len(after) == len(before) + added
+    assert decode(after) == "first part\nsecond part\n"
+
+    with pytest.raises(ValueError):
+        append(io.BytesIO(b"HUF1\x01" + b"\x00" * 8), b"x")
+
+
+@pytest.mark.parametrize(
+    "text",
+    [
+        "A",  # single symbol
+        "Съешь же ещё этих мягких французских булок\n" * 50,  # Cyrillic
+        "😀 mixed ASCII, émoji and 中文\n" * 50,  # 1–4 byte sequences
+        "".join(chr(0x4E00 + (i * 7919) % 2000) for i in range(70000)),  # no newlines
+    ],
+)
+def test_codepoint_roundtrip(text):
+    assert decode(encode(text, alphabet="codepoint")) == text
+
+
+def test_codepoint_alphabet_beats_bytes_on_cjk():
+    rng = random.Random(0)
+    vocab = "的一是不了人我在有他这中大来上个国到说们为子和你地出道也时年得就那要下以生"
+    text = "".join(rng.choice(vocab) for _ in range(20000))
+    assert len(encode(text, alphabet="codepoint")) < 0.6 * len(encode(text))
+
+
+def test_unknown_block_flags_are_unsupported_not_corrupt():
+    buf = bytearray(encode("flagged\n"))
+    buf[5 + 12] |= 0x80  # first block's flags byte
+    with pytest.raises(ValueError, match="Unsupported block flags") as exc:
+        verify(io.BytesIO(bytes(buf)))
+    assert not isinstance(exc.value, CorruptArchiveError)
+
+
+def test_oversized_code_point_is_corrupt():
+    buf = bytearray(encode("日本語のテキスト\n", alphabet="codepoint"))
+    first_delta = 5 + BLOCK_HEADER_SIZE + 1  # after the 1‑byte symbol count
+    buf[first_delta : first_delta + 6] = b"\xff\xff\xff\xff\xff\x7f"
+    with pytest.raises(CorruptArchiveError) as exc:
+        verify(io.BytesIO(bytes(buf)))
+    assert exc.value.offset == 5
@@ -2,11 +2,13 @@
 # tests/test_rle.py
 ###############################################################################
 
+import io
 import random
 
 import pytest
 
-from text_compressor.algorithms.rle import decode, encode
+from text_compressor.algorithms.rle import RLECompressor, append, decode, encode
+from text_compressor.utils.blocks import FLAG_CODEPOINTS, CorruptArchiveError
 
 
 @pytest.mark.parametrize(
@@ -29,3 +31,35 @@ def test_random_roundtrip():
     for _ in range(100):
         text = "".join(random.choice(alphabet) for _ in range(random.randint(1, 512)))
         assert decode(encode(text)) == text
+
+
+def test_compressor_verify_detects_corruption(tmp_path):
+    src = tmp_path / "in.txt"
+    src.write_text("AAAABBBCCD\n" * 10000, encoding="utf-8")
+    arc = tmp_path / "in.rle"
+    comp = RLECompressor()
+    comp.compress(src, arc)
+    assert comp.verify(arc).orig_size == src.stat().st_size
+
+    buf = bytearray(arc.read_bytes())
+    buf[-1] ^= 0xFF  # damage the last block's final symbol
+    arc.write_bytes(bytes(buf))
+    with pytest.raises(CorruptArchiveError):
+        comp.verify(arc)
+
+
+def test_append_to_empty_file_writes_header():
+    buf = io.BytesIO()
+    added = append(buf, b"AAAB\n")
+    assert added == len(buf.getvalue())
+    assert RLECompressor().decompress_bytes(buf.getvalue()) == b"AAAB\n"
+    buf.seek(0)
+    append(buf, b"CC\n")
+    assert RLECompressor().decompress_bytes(buf.getvalue()) == b"AAAB\nCC\n"
+
+
+def test_rle_rejects_codepoint_flag():
+    buf = bytearray(RLECompressor().compress_bytes(b"AAAB\n"))
+    buf[5 + 12] |= FLAG_CODEPOINTS
+    with pytest.raises(ValueError, match="Unsupported block flags"):
+        RLECompressor().decompress_bytes(bytes(buf))
@@ -0,0 +1,99 @@
+# tests/test_search.py
+"""Pytest suite for searching inside compressed archives."""
+import pytest
+
+from text_compressor.compressors import CompressorFactory
+from text_compressor.search import grep
+from text_compressor.utils.blocks import BLOCK_HEADER_SIZE, CorruptArchiveError
+
+
+def _lines():
+    # three ~64 KiB regions: only the middle one contains "Z"
+    lines = [f"alpha {i}\n" for i in range(7000)]
+    lines += [f"Zulu {i}\n" for i in range(7000)]
+    lines += [f"alpha {i}\n" for i in range(7000)]
+    return lines
+
+
+@pytest.fixture(params=["huffman", "rle"])
+def archive(request, tmp_path):
+    src = tmp_path / "in.txt"
+    src.write_text("".join(_lines()), encoding="utf-8")
+    arc = tmp_path / "in.arc"
+    CompressorFactory.get(request.param).compress(src, arc)
+    return src, arc
+
+
+@pytest.mark.parametrize("jobs", [1, 2])
+def test_grep_matches_plain_search(archive, jobs):
+    src, arc = archive
+    text = src.read_bytes()
+    expected = []
+    offset = 0
+    for line in text.split(b"\n")[:-1]:
+        if b"Zulu 69" in line:
+            expected.append((offset, line))
+        offset += len(line) + 1
+
+    got = [(m.offset, m.line) for m in grep("Zulu 69", arc, jobs=jobs)]
+    assert got == expected
+    anchored = [m.line for m in grep(r"^alpha 6999$", arc, jobs=jobs)]
+    assert anchored == [b"alpha 6999"] * 2
+
+
+def test_grep_skips_blocks_without_pattern_bytes(archive):
+    _, arc = archive
+    # Damage the payload of the first block (which has no "Z"): it must be
+    # skipped for a literal search but caught when every block is decoded.
+    buf = bytearray(arc.read_bytes())
+    payload_len = int.from_bytes(buf[9:13], "big")
+    buf[5 + BLOCK_HEADER_SIZE + payload_len - 2] ^= 0x5A
+    arc.write_bytes(bytes(buf))
+
+    assert len(list(grep("Zulu 1", arc, fixed=True, jobs=1))) > 0
+    with pytest.raises(CorruptArchiveError):
+        list(grep("Zulu.1", arc, jobs=1))
+
+
+def test_grep_reports_malformed_block_headers(tmp_path):
+    src = tmp_path / "in.txt"
+    src.write_text("".join(_lines()), encoding="utf-8")
+    for algo in ("huffman", "huffman-unicode", "rle"):
+        arc = tmp_path / f"in.{algo}"
+        CompressorFactory.get(algo).compress(src, arc)
+        buf = bytearray(arc.read_bytes())
+        start = 5 + BLOCK_HEADER_SIZE  # first block's payload
+        if algo == "huffman":
+            tree_size = int.from_bytes(buf[start : start + 2], "big")
+            buf[start : start + 2] = (tree_size - 1).to_bytes(2, "big")
+        elif algo == "huffman-unicode":
+            buf[start + 1] = 0xFF  # first code point far beyond U+10FFFF
+            buf[start + 2] = 0xFF
+            buf[start + 3] = 0x7F
+        else:
+            payload_len = int.from_bytes(buf[9:13], "big")
+            buf[9:13] = (payload_len - 1).to_bytes(4, "big")
+            del buf[start + payload_len - 1]
+        arc.write_bytes(bytes(buf))
+        with pytest.raises(CorruptArchiveError) as exc:
+            list(grep("Z", arc, fixed=True, jobs=1))
+        assert exc.value.offset == 5, algo
+
+
+def test_grep_long_line_across_blocks(tmp_path):
+    src = tmp_path / "long.txt"
+    src.write_text("x" * 150000 + "needle" + "y" * 10 + "\nshort\n", encoding="utf-8")
+    arc = tmp_path / "long.huff"
+    CompressorFactory.get("huffman").compress(src, arc)
+    (match,) = grep("needle", arc, jobs=1)
+    assert match.offset == 0 and len(match.line) == 150016
+
+
+def test_grep_codepoint_blocks(tmp_path):
+    src = tmp_path / "ru.txt"
+    src.write_text("привет мир\n" * 8000 + "поиск строки\n" * 10, encoding="utf-8")
+    arc = tmp_path / "ru.huff"
+    CompressorFactory.get("huffman-unicode").compress(src, arc)
+    matches = list(grep("поиск", arc, jobs=1))
+    assert len(matches) == 10
+    assert matches[0].line.decode("utf-8") == "поиск строки"
@@ -0,0 +1,105 @@
+# tests/test_server.py
+"""Pytest suite for the Unix‑socket compression daemon."""
+import os
+import signal
+import socket
+import threading
+
+import pytest
+
+from text_compressor.client import Client, DaemonUnavailableError
+from text_compressor.server import DaemonServer
+
+pytestmark = pytest.mark.skipif(
+    not hasattr(socket, "AF_UNIX"), reason="Unix domain sockets unavailable"
+)
+
+
+@pytest.fixture
+def server(tmp_path):
+    server = DaemonServer(tmp_path / "d.sock", workers=1)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+    thread.join()
+
+
+@pytest.fixture
+def daemon(server):
+    return server.path
+
+
+def test_bytes_roundtrip(daemon):
+    text = "Hello daemon!\n" * 200
+    with Client.connect(daemon) as client:
+        for algo in ("rle", "huffman"):
+            blob = client.compress_bytes(text.encode("utf-8"), algo)
+            assert client.decompress_bytes(blob).decode("utf-8") == text
+
+
+def test_path_roundtrip_and_errors(daemon, tmp_path):
+    src = tmp_path / "in.txt"
+    src.write_text("path mode " * 100, encoding="utf-8")
+    with Client.connect(daemon) as client:
+        stats = client.compress(src, tmp_path / "in.huff")
+        assert stats.orig_size == src.stat().st_size
+        client.decompress(tmp_path / "in.huff", tmp_path / "back.txt")
+        with pytest.raises(ValueError):
+            client.decompress_bytes(b"not an archive")
+        # The connection survives a failed request.
+        client.ping()  # same protocol and format versions
+    assert (tmp_path / "back.txt").read_text(encoding="utf-8") == src.read_text(
+        encoding="utf-8"
+    )
+
+
+def test_connect_without_daemon(tmp_path):
+    assert Client.connect(tmp_path / "missing.sock") is None
+
+
+def test_dropped_connection_raises_daemon_unavailable(tmp_path):
+    path = tmp_path / "drop.sock"
+    listener = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    listener.bind(str(path))
+    listener.listen(1)
+    thread = threading.Thread(target=lambda: listener.accept()[0].close())
+    thread.start()
+    try:
+        with Client.connect(path) as client:
+            with pytest.raises(DaemonUnavailableError):
+                client.compress_bytes(b"data")
+    finally:
+        thread.join()
+        listener.close()
+
+
+def test_pool_replaced_after_worker_death(server, tmp_path):
+    src = tmp_path / "in.txt"
+    src.write_text("survive " * 100, encoding="utf-8")
+    with Client.connect(server.path) as client:
+        client.request({"op": "ping"})
+        for pid in list(server.pool._processes):
+            os.kill(pid, signal.SIGKILL)
+        with pytest.raises(ValueError):
+            client.compress(src, tmp_path / "in.huff")
+        assert client.request({"op": "ping"})[0]["ok"]
+        client.compress(src, tmp_path / "in.huff")
+
+
+def test_socket_is_owner_only(daemon):
+    assert daemon.stat().st_mode & 0o077 == 0
+
+
+def test_connect_ignores_other_users_socket(daemon, monkeypatch):
+    monkeypatch.setattr(os, "getuid", lambda: os.geteuid() + 1)
+    assert Client.connect(daemon) is None
+
+
+def test_existing_file_at_socket_path_is_kept(tmp_path):
+    notes = tmp_path / "notes.txt"
+    notes.write_text("keep me", encoding="utf-8")
+    with pytest.raises(OSError, match="not a socket"):
+        DaemonServer(notes, workers=1)
+    assert notes.read_text(encoding="utf-8") == "keep me"
@@ -0,0 +1 @@
+"""Lossless text compression using RLE or Huffman coding."""
@@ -0,0 +1,469 @@
+# algorithms/adaptive.py
+"""Single‑pass adaptive Huffman (FGK) coding for unbounded streams.
+
+The static coder must count the whole input before it can emit a bit; this
+one updates its code tree after every symbol, so encoder and decoder work on
+arbitrarily long pipes (``tail -f | text-compressor compress -a adaptive - -``)
+with constant memory and output that trails the input by at most one byte.
+When reading a pipe the CLI also closes a member every ``MEMBER_BYTES`` of
+input or ``MEMBER_SECONDS`` after its first byte, so an archive of a stream
+that is killed instead of reaching EOF loses at most its last member.
+
+On‑disk format – one or more *members*, each:
+
+    +---------+--------------------------+---------+---------+
+    | Header  |   FGK‑coded symbols…     | Padding |  CRC32  |
+    | 5 bytes |        var. bits         | 0‑7 bits| 4 bytes |
+    +---------+--------------------------+---------+---------+
+
+* Header = b"AHF1" + version(1).
+* The alphabet is the 256 byte values plus an end‑of‑member symbol (256).  A
+  symbol's first occurrence is sent as the code of the NYT ("not yet
+  transmitted") leaf followed by the 9‑bit symbol value.
+* The CRC (little‑endian) covers the member's decoded bytes.
+
+Concatenated members decode as the concatenation of their contents, which is
+how appending works.
+
+The tree lives in flat lists indexed by FGK node number (the root is the
+highest number) rather than in linked node objects, so the per‑symbol update
+is a handful of list operations.
+"""
+from __future__ import annotations
+
+from contextlib import contextmanager
+from pathlib import Path
+from typing import BinaryIO, Iterator, List, Optional, Tuple
+import io
+import select
+import signal
+import time
+import zlib
+
+from text_compressor.utils.blocks import CorruptArchiveError
+from text_compressor.utils.stats import Stats, Timer
+
+__all__ = [
+    "encode",
+    "decode",
+    "compress_stream",
+    "decompress_stream",
+    "iter_decode",
+    "verify",
+    "AdaptiveEncoder",
+    "AdaptiveDecoder",
+    "AdaptiveCompressor",
+    "MEMBER_BYTES",
+    "MEMBER_SECONDS",
+]
+
+_MAGIC = b"AHF1\x01"
+_EOF = 256
+_NSYM = 257
+_SIZE = 2 * _NSYM + 1  # symbol leaves + NYT + internal nodes
+_ROOT = _SIZE - 1
+_CHUNK = 1 << 16
+MEMBER_BYTES = 1 << 20  # input per member when streaming from a pipe
+MEMBER_SECONDS = 5.0  # longest a member stays open when streaming
+
+
+# ---------------------------------------------------------------------------
+# FGK tree
+# ---------------------------------------------------------------------------
+
+
+class _Tree:
+    """FGK code tree; node numbers double as the sibling‑property order."""
+
+    __slots__ = ("weight", "parent", "left", "right", "symbol", "leaf", "nyt")
+
+    def __init__(self) -> None:
+        self.weight: List[int] = [0] * _SIZE
+        self.parent: List[int] = [-1] * _SIZE
+        self.left: List[int] = [-1] * _SIZE  # -1 for leaves
+        self.right: List[int] = [-1] * _SIZE
+        self.symbol: List[int] = [-1] * _SIZE  # -1 for internal nodes / NYT
+        self.leaf: List[int] = [-1] * _NSYM  # symbol → node number
+        self.nyt = _ROOT  # empty tree: the root is the NYT leaf
+
+    def code(self, node: int) -> Tuple[int, int]:
+        """Return ``(bits, length)`` of the path from the root to *node*."""
+        bits = length = 0
+        parent, right = self.parent, self.right
+        while node != _ROOT:
+            p = parent[node]
+            if right[p] == node:
+                bits |= 1 << length
+            length += 1
+            node = p
+        return bits, length
+
+    def update(self, sym: int) -> None:
+        weight, parent = self.weight, self.parent
+        node = self.leaf[sym]
+        if node == -1:
+            # split NYT: new NYT on the left, the new symbol's leaf on the right
+            old = self.nyt
+            leaf, nyt = old - 1, old - 2
+            self.left[old], self.right[old] = nyt, leaf
+            parent[leaf] = parent[nyt] = old
+            self.symbol[leaf] = sym
+            self.leaf[sym] = leaf
+            self.nyt = nyt
+            node = leaf
+        while node != -1:
+            # move to the highest‑numbered node of equal weight first
+            w = weight[node]
+            leader = node
+            while leader < _ROOT and weight[leader + 1] == w:
+                leader += 1
+            if leader != node and leader != parent[node]:
+                self._swap(node, leader)
+                node = leader
+            weight[node] = w + 1
+            node = parent[node]
+
+    def _swap(self, a: int, b: int) -> None:
+        """Exchange the subtrees at node numbers *a* and *b*."""
+        for arr in (self.weight, self.left, self.right, self.symbol):
+            arr[a], arr[b] = arr[b], arr[a]
+        for n in (a, b):
+            if self.left[n] != -1:
+                self.parent[self.left[n]] = n
+                self.parent[self.right[n]] = n
+            else:
+                self.leaf[self.symbol[n]] = n
+
+
+# ---------------------------------------------------------------------------
+# Streaming encoder / decoder
+# ---------------------------------------------------------------------------
+
+
+class AdaptiveEncoder:
+    """Incremental encoder for one member: ``update()`` then ``finish()``."""
+
+    def __init__(self) -> None:
+        self._tree = _Tree()
+        self._out = bytearray(_MAGIC)
+        self._acc = 0  # pending bits, MSB first
+        self._nacc = 0
+        self._crc = 0
+
+    def _put(self, bits: int, width: int) -> None:
+        acc = (self._acc << width) | bits
+        nacc = self._nacc + width
+        out = self._out
+        while nacc >= 8:
+            nacc -= 8
+            out.append((acc >> nacc) & 0xFF)
+        self._acc = acc & ((1 << nacc) - 1)
+        self._nacc = nacc
+
+    def _emit(self, sym: int) -> None:
+        tree = self._tree
+        node = tree.leaf[sym] if sym != _EOF else -1
+        if node == -1:
+            self._put(*tree.code(tree.nyt))
+            self._put(sym, 9)
+        else:
+            self._put(*tree.code(node))
+
+    def _drain(self) -> bytes:
+        out = bytes(self._out)
+        self._out.clear()
+        return out
+
+    def update(self, data: bytes) -> bytes:
+        """Encode *data*; return every output byte that is now complete."""
+        tree = self._tree
+        for sym in data:
+            self._emit(sym)
+            tree.update(sym)
+        self._crc = zlib.crc32(data, self._crc)
+        return self._drain()
+
+    def finish(self) -> bytes:
+        """Emit end‑of‑member, padding and CRC; return the remaining bytes."""
+        self._emit(_EOF)
+        if self._nacc:
+            self._put(0, 8 - self._nacc)
+        self._out.extend(self._crc.to_bytes(4, "little"))
+        return self._drain()
+
+
+class AdaptiveDecoder:
+    """Incremental decoder for a sequence of members: ``feed()`` then ``close()``."""
+
+    def __init__(self) -> None:
+        self._buf = bytearray()
+        self._consumed = 0  # archive offset of _buf[0]
+        self._member_at = 0
+        self._phase = "header"  # → "bits" → "crc" → "header" …
+        self._tree = _Tree()
+        self._node = _ROOT
+        self._lit_left = 0
+        self._lit = 0
+        self._crc = 0
+        self.members = 0  # members decoded and CRC‑checked so far
+
+    def _corrupt(self, message: str) -> CorruptArchiveError:
+        return CorruptArchiveError(message, self._member_at)
+
+    def _start_member(self) -> None:
+        self._tree = _Tree()
+        self._node = _ROOT
+        self._lit_left, self._lit = 9, 0  # first symbol is always a literal
+        self._crc = 0
+
+    def _decode_bits(self, out: bytearray) -> int:
+        """Decode from ``_buf``; return the number of whole bytes consumed."""
+        tree = self._tree
+        left, right, symbol = tree.left, tree.right, tree.symbol
+        node, lit_left, lit = self._node, self._lit_left, self._lit
+        start = len(out)
+        used = 0
+        for byte in self._buf:
+            used += 1
+            for shift in (7, 6, 5, 4, 3, 2, 1, 0):
+                bit = (byte >> shift) & 1
+                if lit_left:
+                    lit = (lit << 1) | bit
+                    lit_left -= 1
+                    if lit_left:
+                        continue
+                    if lit > _EOF or (lit != _EOF and tree.leaf[lit] != -1):
+                        raise self._corrupt("Invalid adaptive Huffman literal")
+                    sym = lit
+                else:
+                    node = right[node] if bit else left[node]
+                    if left[node] != -1:
+                        continue
+                    if node == tree.nyt:
+                        lit_left, lit = 9, 0
+                        continue
+                    sym = symbol[node]
+                if sym == _EOF:
+                    self._crc = zlib.crc32(out[start:], self._crc)
+                    self._phase = "crc"
+                    return used  # rest of this byte is padding
+                out.append(sym)
+                tree.update(sym)
+                node = _ROOT
+        self._node, self._lit_left, self._lit = node, lit_left, lit
+        self._crc = zlib.crc32(out[start:], self._crc)
+        return used
+
+    def feed(self, chunk: bytes) -> bytes:
+        """Consume *chunk*; return the bytes it completes."""
+        self._buf.extend(chunk)
+        out = bytearray()
+        while self._buf:
+            if self._phase == "header":
+                if len(self._buf) < len(_MAGIC):
+                    break
+                self._member_at = self._consumed
+                if self._buf[: len(_MAGIC)] != _MAGIC:
+                    raise self._corrupt("Invalid adaptive Huffman header")
+                used = len(_MAGIC)
+                self._start_member()
+                self._phase = "bits"
+            elif self._phase == "bits":
+                used = self._decode_bits(out)
+            else:
+                if len(self._buf) < 4:
+                    break
+                if int.from_bytes(self._buf[:4], "little") != self._crc:
+                    raise self._corrupt("CRC mismatch – corrupted archive")
+                self.members += 1
+                used = 4
+                self._phase = "header"
+            del self._buf[:used]
+            self._consumed += used
+        return bytes(out)
+
+    def close(self) -> None:
+        """Raise unless the input ended cleanly after a complete member."""
+        if self._phase != "header" or self._buf:
+            raise self._corrupt("Truncated adaptive Huffman stream")
+
+
+# ---------------------------------------------------------------------------
+# Stream / buffer helpers
+# ---------------------------------------------------------------------------
+
+
+def _read(src: BinaryIO) -> bytes:
+    # read1 returns as soon as *some* data is available, which keeps latency
+    # low on pipes; plain read() is the fallback for other file objects.
+    return getattr(src, "read1", src.read)(_CHUNK)
+
+
+def _wait(src: BinaryIO, timeout: float) -> None:
+    """Wait up to *timeout* seconds for *src* to have data (pipes, sockets);
+    return at once for inputs that cannot be polled."""
+    try:
+        select.select([src.fileno()], [], [], timeout)
+    except (AttributeError, OSError, ValueError, io.UnsupportedOperation):
+        pass
+
+
+@contextmanager
+def _signals_deferred() -> Iterator[None]:
+    """Hold SIGINT / SIGTERM until the block ends, so an interrupt never lands
+    half way through a tree update and leaves a member that cannot be closed."""
+    if not hasattr(signal, "pthread_sigmask"):
+        yield
+        return
+    old = signal.pthread_sigmask(signal.SIG_BLOCK, {signal.SIGINT, signal.SIGTERM})
+    try:
+        yield
+    finally:
+        signal.pthread_sigmask(signal.SIG_SETMASK, old)
+
+
+def compress_stream(
+    src: BinaryIO,
+    dst: BinaryIO,
+    member_bytes: Optional[int] = None,
+    member_seconds: Optional[float] = None,
+) -> Tuple[int, int]:
+    """Encode *src* onto *dst* as data arrives.
+
+    Output is flushed after every input chunk.  With *member_bytes* or
+    *member_seconds* a member is closed once it holds that much input, or
+    that long after its first byte, so a stream that never reaches EOF is
+    complete up to the last closed member.  If an exception (e.g.
+    ``KeyboardInterrupt``) stops the loop, the open member is still finished
+    before it propagates.  Returns ``(raw, compressed)`` byte counts."""
+    enc = AdaptiveEncoder()
+    raw = comp = pending = members = 0
+    started = 0.0  # time.monotonic() of the open member's first byte
+
+    def write(out: bytes) -> None:
+        nonlocal comp
+        dst.write(out)
+        dst.flush()
+        comp += len(out)
+
+    try:
+        while True:
+            if pending and member_seconds is not None:
+                _wait(src, started + member_seconds - time.monotonic())
+            with _signals_deferred():
+                due = pending and (
+                    (member_bytes is not None and pending >= member_bytes)
+                    or (
+                        member_seconds is not None
+                        and time.monotonic() - started >= member_seconds
+                    )
+                )
+                if due:
+                    write(enc.finish())
+                    members += 1
+                    enc, pending = AdaptiveEncoder(), 0
+            chunk = _read(src)
+            if not chunk:
+                break
+            with _signals_deferred():
+                if not pending:
+                    started = time.monotonic()
+                raw += len(chunk)
+                pending += len(chunk)
+                write(enc.update(chunk))
+    finally:
+        with _signals_deferred():
+            if pending or not members:
+                write(enc.finish())
+    return raw, comp
+
+
+def iter_decode(src: BinaryIO, head: bytes = b"") -> Iterator[bytes]:
+    """Yield decoded chunks of the archive read from *src*.
+
+    *head* holds bytes already consumed from *src* (e.g. to sniff the magic)."""
+    dec = AdaptiveDecoder()
+    chunk = head or _read(src)
+    while chunk:
+        out = dec.feed(chunk)
+        if out:
+            yield out
+        chunk = _read(src)
+    dec.close()
+
+
+def decompress_stream(src: BinaryIO, dst: BinaryIO, head: bytes = b"") -> int:
+    """Decode *src* to *dst* chunk by chunk; return the decoded byte count."""
+    size = 0
+    for out in iter_decode(src, head):
+        dst.write(out)
+        dst.flush()
+        size += len(out)
+    return size
+
+
+def verify(f: BinaryIO) -> Tuple[int, int]:
+    """Decode every member of *f*, discarding output; return ``(members, bytes)``."""
+    dec = AdaptiveDecoder()
+    size = 0
+    while chunk := _read(f):
+        size += len(dec.feed(chunk))
+    dec.close()
+    return dec.members, size
+
+
+def encode(text: str) -> bytes:
+    """Return an adaptive‑Huffman archive for *text* (UTF‑8)."""
+    enc = AdaptiveEncoder()
+    return enc.update(text.encode("utf-8")) + enc.finish()
+
+
+def decode(buf: bytes) -> str:
+    if not buf:
+        return ""
+    return b"".join(iter_decode(io.BytesIO(buf))).decode("utf-8")
+
+
+# ---------------------------------------------------------------------------
+# Compressor wrapper (for CLI)
+# ---------------------------------------------------------------------------
+
+
+class AdaptiveCompressor:
+    """File‑oriented wrapper; every method streams in fixed‑size chunks."""
+
+    ext = ".ahf"
+
+    def compress(self, in_path: Path, out_path: Path) -> Stats:
+        with Timer() as t, open(in_path, "rb") as src, open(out_path, "wb") as dst:
+            raw, comp = compress_stream(src, dst)
+        return Stats(raw, comp, comp / raw if raw else 0, t.elapsed())
+
+    def decompress(self, in_path: Path, out_path: Path) -> Stats:
+        with Timer() as t, open(in_path, "rb") as src, open(out_path, "wb") as dst:
+            raw = decompress_stream(src, dst)
+        comp = Path(in_path).stat().st_size
+        return Stats(raw, comp, comp / raw if raw else 0, t.elapsed())
+
+    def verify(self, in_path: Path) -> Stats:
+        with Timer() as t, open(in_path, "rb") as f:
+            _, raw = verify(f)
+        comp = Path(in_path).stat().st_size
+        return Stats(raw, comp, comp / raw if raw else 0, t.elapsed())
+
+    def append(self, in_path: Path, out_path: Path) -> Stats:
+        """Add *in_path* to archive *out_path* as a new member."""
+        with open(out_path, "rb") as f:
+            head = f.read(len(_MAGIC))
+        if head and head != _MAGIC:
+            raise ValueError("Invalid adaptive Huffman header")
+        with Timer() as t, open(in_path, "rb") as src, open(out_path, "ab") as dst:
+            raw, comp = compress_stream(src, dst)
+        return Stats(raw, comp, comp / raw if raw else 0, t.elapsed())
+
+    def compress_bytes(self, data: bytes) -> bytes:
+        enc = AdaptiveEncoder()
+        return enc.update(data) + enc.finish()
+
+    def decompress_bytes(self, blob: bytes) -> bytes:
+        return b"".join(iter_decode(io.BytesIO(blob)))
@@ -1,8 +1,8 @@
 # text_compressor/algorithms/huffman.py
 """Huffman‑coding compressor for Text‑Compressor.
 
-Implements a canonical static Huffman code for any UTF‑8 text.  The on‑disk
-format is:
+Implements a canonical static Huffman code for any UTF‑8 text.  The original
+(version 1) on‑disk format is:
 
     +---------+----------+-----------+--------------+--------------+
     | Header  |  CRC32   | Tree Size |  Tree Bytes  | Enc. Bits... |
@@ -20,20 +20,47 @@ from __future__ import annotations
 
 from collections import Counter
 from dataclasses import dataclass
+from functools import lru_cache
+import io
 from pathlib import Path
-from typing import Dict, List, Optional, Tuple
+from typing import BinaryIO, Dict, FrozenSet, Iterator, List, Optional, Tuple
 import zlib
 
 from text_compressor.utils.bitstream import BitReader, BitWriter
+from text_compressor.utils.blocks import (
+    FLAG_CODEPOINTS,
+    FLAG_LINE_END,
+    Block,
+    CorruptArchiveError,
+    iter_blocks,
+    split_blocks,
+    write_block,
+)
 from text_compressor.utils.stats import Stats, Timer
 
 __all__ = [
     "encode",
     "decode",
+    "append",
+    "verify",
+    "block_symbols",
+    "decode_block",
+    "BLOCK_FLAGS",
     "HuffmanCompressor",
 ]
 
-_MAGIC = b"HUF1\x01"  # 5‑byte header (4‑byte tag + version)
+_MAGIC_V1 = b"HUF1\x01"  # 5‑byte header (4‑byte tag + version)
+_MAGIC = b"HUF1\x02"  # block‑framed format
+BLOCK_FLAGS = FLAG_LINE_END | FLAG_CODEPOINTS  # block flags this reader knows
+# what parsing a malformed body raises; reported as CorruptArchiveError
+_MALFORMED = (
+    IndexError,
+    AttributeError,
+    TypeError,
+    ValueError,
+    OverflowError,
+    RecursionError,
+)
 
 
 @dataclass(order=True)
@@ -53,7 +80,24 @@ class _Node:
 
 
 def _build_tree(data: bytes) -> _Node:
-    heap: List[_Node] = [_Node(f, s) for s, f in Counter(data).items()]
+    return _table(_histogram(data))[0]
+
+
+def _histogram(data: bytes) -> Tuple[Tuple[int, int], ...]:
+    """Hashable (symbol, freq) histogram used as the code‑table cache key."""
+    return tuple(sorted(Counter(data).items()))
+
+
+@lru_cache(maxsize=256)
+def _table(hist: Tuple[Tuple[int, int], ...]) -> Tuple[_Node, Dict[int, str]]:
+    """Return ``(tree, codes)`` for *hist*; identical histograms – common when
+    the same files are compressed repeatedly – reuse the built table."""
+    root = _tree_from_histogram(hist)
+    return root, _gen_codes(root)
+
+
+def _tree_from_histogram(hist: Tuple[Tuple[int, int], ...]) -> _Node:
+    heap: List[_Node] = [_Node(f, s) for s, f in hist]
     heap.sort()  # simple list as priority queue (n is small for text)
     while len(heap) > 1:
         n1, n2 = heap.pop(0), heap.pop(0)
@@ -109,20 +153,14 @@ def _deserialize_tree(reader: memoryview, idx: int = 0) -> Tuple[_Node, int]:
 
 
 # ---------------------------------------------------------------------------
-# Public encode / decode helpers (stateless)
+# Block body helpers
 # ---------------------------------------------------------------------------
 
 
-def encode(text: str) -> bytes:
-    """Return Huffman‑compressed bytes for *text* (UTF‑8)."""
-    if not text:
-        return b""
-
-    data = text.encode("utf-8")
-
+def _encode_body(data: bytes) -> bytes:
+    """Return tree size + tree + bit‑count + bitstream for non‑empty *data*."""
     # 1️⃣  Build tree and code‑map
-    root = _build_tree(data)
-    codes = _gen_codes(root)
+    root, codes = _table(_histogram(data))
 
     # 2️⃣  Encode the data bit‑by‑bit
     bw = BitWriter()
@@ -138,38 +176,22 @@ def encode(text: str) -> bytes:
     _serialize_tree(root, tree_buf)  # fills tree_buf
     tree_buf.extend(total_bits.to_bytes(3, "big"))  # 🔹 append bit‑count here
 
-    # 4️⃣  Now compute *tree_size* including the 2‑byte bit‑count
+    # 4️⃣  Now compute *tree_size* including the 3‑byte bit‑count
     tree_size = len(tree_buf).to_bytes(2, "big")  # big‑endian
+    return tree_size + bytes(tree_buf) + bitstream
 
-    # 5️⃣  Assemble final archive
-    crc = zlib.crc32(data).to_bytes(4, "little")
-    header = _MAGIC + crc + tree_size  # 5 + 4 + 2 bytes
-    return header + bytes(tree_buf) + bitstream
-
-
-# algorithms/huffman.py  – inside decode()
-
-
-def decode(buf: bytes) -> str:
-    if not buf:
-        return ""
-
-    if buf[:5] != _MAGIC:
-        raise ValueError("Invalid Huffman header")
 
-    crc = int.from_bytes(buf[5:9], "little")
-    tree_size = int.from_bytes(buf[9:11], "big")
-    tree_end = 11 + tree_size
-    tree_mv = memoryview(buf[11:tree_end])
+def _decode_body(buf: bytes) -> bytes:
+    """Inverse of :func:`_encode_body` – returns the raw bytes (no CRC check)."""
+    tree_size = int.from_bytes(buf[0:2], "big")
+    tree_end = 2 + tree_size
+    tree_mv = memoryview(buf[2:tree_end])
     root, idx = _deserialize_tree(tree_mv)
     total_bits = int.from_bytes(tree_mv[idx : idx + 3], "big")
 
     # 🔹 Special‑case: single‑leaf tree
     if root.is_leaf():
-        decoded_bytes = bytes([root.symbol] * (total_bits or 1))
-        if zlib.crc32(decoded_bytes) != crc:
-            raise ValueError("CRC mismatch – corrupted archive")
-        return decoded_bytes.decode("utf-8")
+        return bytes([root.symbol] * (total_bits or 1))
 
     reader = BitReader(buf[tree_end:], total_bits)
     out = bytearray()
@@ -184,42 +206,382 @@ def decode(buf: bytes) -> str:
         if node.is_leaf():
             out.append(node.symbol)
             node = root
+    return bytes(out)
+
+
+# ---------------------------------------------------------------------------
+# Code‑point alphabet (FLAG_CODEPOINTS blocks)
+# ---------------------------------------------------------------------------
+#
+# Body layout (all integers are LEB128 varints unless noted):
+#
+#   n_symbols | n × code‑point delta | n × code length (1 byte) | total bits | bits
+#
+# Symbols are listed in ascending code‑point order, each as the distance from
+# the previous one, so a sparse alphabet (a few hundred CJK characters out of
+# 0x10FFFF) costs one to three bytes per symbol.  Codes are canonical: they
+# follow from the lengths alone, ordered by (length, code point).
+
+_LOOKUP_BITS = 11  # primary decode table covers codes up to this length
+_MAX_CODEPOINT = 0x10FFFF
+_CP_VARINT = 3  # bytes: enough for any code point or alphabet size
+_BITS_VARINT = 5  # bytes: enough for the bit count of a whole block
+
+
+def _put_varint(out: bytearray, n: int) -> None:
+    while n >= 0x80:
+        out.append((n & 0x7F) | 0x80)
+        n >>= 7
+    out.append(n)
+
+
+def _get_varint(buf: bytes, idx: int, max_bytes: int) -> Tuple[int, int]:
+    """Read a varint of at most *max_bytes* bytes, so corrupt input cannot
+    produce an unbounded integer."""
+    n = 0
+    for shift in range(0, 7 * max_bytes, 7):
+        byte = buf[idx]
+        idx += 1
+        n |= (byte & 0x7F) << shift
+        if byte < 0x80:
+            return n, idx
+    raise ValueError(f"varint longer than {max_bytes} bytes")
+
+
+@lru_cache(maxsize=256)
+def _cp_lengths(hist: Tuple[Tuple[int, int], ...]) -> Dict[int, int]:
+    """Code length per code point for *hist* (``(code point, freq)`` pairs)."""
+    lengths: Dict[int, int] = {}
+
+    def dfs(node: _Node, depth: int):
+        if node.is_leaf():
+            lengths[node.symbol] = depth or 1  # single‑symbol edge case
+        else:
+            dfs(node.left, depth + 1)
+            dfs(node.right, depth + 1)
+
+    dfs(_tree_from_histogram(hist), 0)
+    return lengths
+
+
+def _canonical(lengths: Dict[int, int]) -> List[Tuple[int, int, int]]:
+    """Return ``(code point, code, length)`` in canonical order."""
+    ordered = sorted(lengths.items(), key=lambda item: (item[1], item[0]))
+    out = []
+    code = 0
+    prev = ordered[0][1]
+    for cp, length in ordered:
+        code <<= length - prev
+        out.append((cp, code, length))
+        code += 1
+        prev = length
+    return out
+
+
+def _encode_cp_body(data: bytes) -> bytes:
+    """Code‑point counterpart of :func:`_encode_body` for non‑empty UTF‑8 *data*."""
+    text = data.decode("utf-8")
+    lengths = _cp_lengths(tuple(sorted((ord(c), f) for c, f in Counter(text).items())))
+    table = {chr(cp): (code, length) for cp, code, length in _canonical(lengths)}
+
+    body = bytearray()
+    _put_varint(body, len(lengths))
+    prev = 0
+    for cp in sorted(lengths):
+        _put_varint(body, cp - prev)
+        prev = cp
+    body.extend(lengths[cp] for cp in sorted(lengths))
+
+    bits = bytearray()
+    acc = nacc = total = 0
+    for ch in text:
+        code, length = table[ch]
+        acc = (acc << length) | code
+        nacc += length
+        total += length
+        while nacc >= 8:
+            nacc -= 8
+            bits.append((acc >> nacc) & 0xFF)
+        acc &= (1 << nacc) - 1
+    if nacc:
+        bits.append((acc << (8 - nacc)) & 0xFF)
+
+    _put_varint(body, total)
+    return bytes(body + bits)
+
+
+def _read_cp_header(buf: bytes) -> Tuple[List[int], List[int], int]:
+    """Return ``(code points, lengths, index after the lengths)``."""
+    n, idx = _get_varint(buf, 0, _CP_VARINT)
+    cps = []
+    cp = 0
+    for _ in range(n):
+        delta, idx = _get_varint(buf, idx, _CP_VARINT)
+        cp += delta
+        if cp > _MAX_CODEPOINT:
+            raise ValueError(f"code point 0x{cp:x} out of range")
+        cps.append(cp)
+    lengths = list(buf[idx : idx + n])
+    if len(lengths) != n:
+        raise IndexError("truncated code‑length table")
+    return cps, lengths, idx + n
+
+
+def _decode_cp_body(buf: bytes) -> bytes:
+    """Inverse of :func:`_encode_cp_body`; writes UTF‑8 straight to the output."""
+    cps, lengths, idx = _read_cp_header(buf)
+    total, idx = _get_varint(buf, idx, _BITS_VARINT)
+    canon = _canonical(dict(zip(cps, lengths)))
+    utf8 = [chr(cp).encode("utf-8") for cp, _, _ in canon]
+    max_len = canon[-1][2]
+
+    # Primary table: every K‑bit prefix → (UTF‑8 bytes, code length); codes
+    # longer than K bits are resolved canonically from the per‑length ranges.
+    k = min(max_len, _LOOKUP_BITS)
+    t_len = [0] * (1 << k)
+    t_sym = [b""] * (1 << k)
+    count = [0] * (max_len + 2)
+    for i, (_, code, length) in enumerate(canon):
+        count[length] += 1
+        if length <= k:
+            lo = code << (k - length)
+            for j in range(lo, lo + (1 << (k - length))):
+                t_len[j] = length
+                t_sym[j] = utf8[i]
+    first_code = [0] * (max_len + 2)
+    first_index = [0] * (max_len + 2)
+    code = index = 0
+    for length in range(1, max_len + 1):
+        first_code[length] = code
+        first_index[length] = index
+        code = (code + count[length]) << 1
+        index += count[length]
+
+    data = buf[idx:]
+    out = bytearray()
+    acc = nacc = pos = consumed = 0
+    n = len(data)
+    while consumed < total:
+        while nacc < max_len and pos < n:
+            acc = (acc << 8) | data[pos]
+            pos += 1
+            nacc += 8
+        peek = (acc >> (nacc - k)) if nacc >= k else (acc << (k - nacc))
+        length = t_len[peek & ((1 << k) - 1)]
+        if length:
+            out += t_sym[peek & ((1 << k) - 1)]
+        else:
+            length = k
+            while True:
+                length += 1
+                if length > max_len or length > nacc:
+                    raise IndexError("invalid code in bitstream")
+                code = acc >> (nacc - length)
+                rel = code - first_code[length]
+                if 0 <= rel < count[length]:
+                    out += utf8[first_index[length] + rel]
+                    break
+        if length > nacc:
+            raise IndexError("bitstream shorter than its bit count")
+        nacc -= length
+        consumed += length
+        acc &= (1 << nacc) - 1
+    return bytes(out)
+
+
+def _cp_symbols(buf: bytes) -> FrozenSet[int]:
+    """UTF‑8 byte values of every code point in a code‑point block's header."""
+    cps, _, _ = _read_cp_header(buf)
+    return frozenset(b for cp in cps for b in chr(cp).encode("utf-8"))
+
+
+def _check_body(buf: bytes, offset: int, flags: int = 0) -> bytes:
+    """Decode a body, turning malformed input into :class:`CorruptArchiveError`."""
+    try:
+        if flags & FLAG_CODEPOINTS:
+            return _decode_cp_body(buf)
+        return _decode_body(buf)
+    except _MALFORMED as exc:
+        raise CorruptArchiveError(f"Malformed Huffman block: {exc}", offset) from exc
+
+
+def decode_block(block: Block) -> bytes:
+    """Decode and CRC‑check one v2 block."""
+    block.require(BLOCK_FLAGS)
+    raw = _check_body(block.payload, block.offset, block.flags)
+    block.check(raw)
+    return raw
+
+
+def block_symbols(block: Block) -> FrozenSet[int]:
+    """Return the byte values present in *block*, read from its tree alone."""
+    block.require(BLOCK_FLAGS)
+    try:
+        if block.flags & FLAG_CODEPOINTS:
+            return _cp_symbols(block.payload)
+        return _tree_symbols(block.payload)
+    except _MALFORMED as exc:
+        raise CorruptArchiveError(
+            f"Malformed Huffman block: {exc}", block.offset
+        ) from exc
+
+
+def _tree_symbols(buf: bytes) -> FrozenSet[int]:
+    """Byte values of the leaves in a byte‑alphabet block's serialised tree."""
+    tree_size = int.from_bytes(buf[0:2], "big")
+    if tree_size < 5 or 2 + tree_size > len(buf):
+        raise IndexError("tree size out of range")
+    tree = buf[2 : 2 + tree_size - 3]  # drop the 3‑byte bit‑count
+    symbols = set()
+    idx = 0
+    while idx < len(tree):
+        if tree[idx] == 0x01:
+            symbols.add(tree[idx + 1])
+            idx += 2
+        else:
+            idx += 1
+    return frozenset(symbols)
+
+
+def _iter_raw(f: BinaryIO) -> Iterator[bytes]:
+    """Yield verified raw chunks from an open archive (v1 or v2)."""
+    magic = f.read(5)
+    if not magic:
+        return  # empty input encodes to an empty archive
+    if magic == _MAGIC_V1:
+        buf = f.read()
+        crc = int.from_bytes(buf[0:4], "little")
+        raw = _check_body(buf[4:], 0)
+        if zlib.crc32(raw) != crc:
+            raise CorruptArchiveError("CRC mismatch – corrupted archive", 0)
+        yield raw
+        return
+    if magic != _MAGIC:
+        raise ValueError("Invalid Huffman header")
+    for block in iter_blocks(f, len(_MAGIC), BLOCK_FLAGS):
+        yield decode_block(block)
+
+
+# ---------------------------------------------------------------------------
+# Public encode / decode helpers (stateless)
+# ---------------------------------------------------------------------------
+
+
+def _write_blocks(out: BinaryIO, data: bytes, alphabet: str) -> int:
+    if alphabet == "codepoint":
+        body, flags = _encode_cp_body, FLAG_CODEPOINTS
+    elif alphabet == "byte":
+        body, flags = _encode_body, 0
+    else:
+        raise ValueError(f"Unsupported alphabet: {alphabet}")
+    size = 0
+    for chunk in split_blocks(data):
+        size += write_block(out, chunk, body(chunk), flags)
+    return size
+
+
+def encode(text: str, alphabet: str = "byte") -> bytes:
+    """Return Huffman‑compressed bytes for *text* (UTF‑8).
+
+    ``alphabet="codepoint"`` builds codes over Unicode code points instead of
+    UTF‑8 bytes, which suits CJK, Cyrillic and other multi‑byte scripts."""
+    if not text:
+        return b""
 
-    if zlib.crc32(out) != crc:
-        raise ValueError("CRC mismatch – corrupted archive")
+    out = io.BytesIO()
+    out.write(_MAGIC)
+    _write_blocks(out, text.encode("utf-8"), alphabet)
+    return out.getvalue()
+
+
+def decode(buf: bytes) -> str:
+    if not buf:
+        return ""
+
+    out = bytearray()
+    for raw in _iter_raw(io.BytesIO(buf)):
+        out.extend(raw)
     return out.decode("utf-8")
 
 
+def append(f: BinaryIO, data: bytes, alphabet: str = "byte") -> int:
+    """Append *data* to the archive open in *f* (mode ``"r+b"``) as new blocks.
+
+    Existing blocks are neither read nor rewritten, so the cost depends only
+    on the size of *data*.  Returns the number of bytes added."""
+    magic = f.read(5)
+    if magic == _MAGIC_V1:
+        raise ValueError("Cannot append to a version‑1 archive; recompress it first")
+    if magic and magic != _MAGIC:
+        raise ValueError("Invalid Huffman header")
+    f.seek(0, io.SEEK_END)
+    size = 0
+    if not magic and data:
+        f.write(_MAGIC)
+        size = len(_MAGIC)
+    return size + _write_blocks(f, data, alphabet)
+
+
+def verify(f: BinaryIO) -> Tuple[int, int]:
+    """Check every block of the archive open in *f* without keeping its output.
+
+    Returns ``(blocks, raw_bytes)``; raises :class:`CorruptArchiveError` at the
+    first block whose contents do not match its CRC."""
+    blocks = size = 0
+    for raw in _iter_raw(f):
+        blocks += 1
+        size += len(raw)
+    return blocks, size
+
+
 # ---------------------------------------------------------------------------
 # Compressor wrapper (for CLI)
 # ---------------------------------------------------------------------------
 
 
 class HuffmanCompressor:
-    """File‑oriented compressor used by CLI."""
+    """File‑oriented compressor used by CLI.
+
+    *alphabet* selects the symbols new blocks are coded over (``"byte"`` or
+    ``"codepoint"``); reading handles either transparently."""
 
     ext = ".huff"
 
+    def __init__(self, alphabet: str = "byte"):
+        self.alphabet = alphabet
+
     def compress(self, in_path: Path, out_path: Path) -> Stats:
         raw = in_path.read_text(encoding="utf-8")
         with Timer() as t:
-            comp = encode(raw)
+            comp = encode(raw, self.alphabet)
         out_path.write_bytes(comp)
-        return Stats(
-            len(raw.encode("utf-8")),
-            len(comp),
-            len(comp) / len(raw.encode("utf-8")),
-            t.elapsed,
-        )
+        size = len(raw.encode("utf-8"))
+        return Stats(size, len(comp), len(comp) / size if size else 0, t.elapsed())
 
     def decompress(self, in_path: Path, out_path: Path) -> Stats:
         comp = in_path.read_bytes()
         with Timer() as t:
             raw = decode(comp)
         out_path.write_text(raw, encoding="utf-8")
-        return Stats(
-            len(raw.encode("utf-8")),
-            len(comp),
-            len(comp) / len(raw.encode("utf-8")),
-            t.elapsed,
-        )
+        size = len(raw.encode("utf-8"))
+        return Stats(size, len(comp), len(comp) / size if size else 0, t.elapsed())
+
+    def append(self, in_path: Path, out_path: Path) -> Stats:
+        """Add the contents of *in_path* to the end of archive *out_path*."""
+        raw = in_path.read_text(encoding="utf-8").encode("utf-8")
+        with Timer() as t, open(out_path, "r+b") as f:
+            added = append(f, raw, self.alphabet)
+        return Stats(len(raw), added, added / len(raw) if raw else 0, t.elapsed())
+
+    def compress_bytes(self, data: bytes) -> bytes:
+        """Return a complete archive for UTF‑8 *data* (no file I/O)."""
+        return encode(data.decode("utf-8"), self.alphabet)
+
+    def decompress_bytes(self, blob: bytes) -> bytes:
+        return b"".join(_iter_raw(io.BytesIO(blob)))
+
+    def verify(self, in_path: Path) -> Stats:
+        with Timer() as t, open(in_path, "rb") as f:
+            _, size = verify(f)
+        comp_size = Path(in_path).stat().st_size
+        return Stats(size, comp_size, comp_size / size if size else 0, t.elapsed())
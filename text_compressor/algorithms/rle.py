@@ -4,16 +4,37 @@ and a high‑level *RLECompressor* class compatible with the project‑wide
 *Compressor* interface (compress / decompress / returns Stats)."""
 from __future__ import annotations
 
+import io
 from pathlib import Path
+from typing import BinaryIO, FrozenSet, Iterator, Tuple
+
+from text_compressor.utils.blocks import (
+    FLAG_LINE_END,
+    Block,
+    CorruptArchiveError,
+    iter_blocks,
+    split_blocks,
+    write_block,
+)
 from text_compressor.utils.stats import (
     Stats,
     Timer,
 )  # Stats & Timer helpers will be added later
 
-__all__ = ["encode", "decode", "RLECompressor"]
+__all__ = [
+    "encode",
+    "decode",
+    "append",
+    "verify",
+    "block_symbols",
+    "decode_block",
+    "BLOCK_FLAGS",
+    "RLECompressor",
+]
 
 _MAGIC = b"RLE1"  # 4‑byte header
-_VERSION = 1  # 1‑byte version
+_VERSION = 2  # 1‑byte version (2 = block‑framed, 1 = bare pairs)
+BLOCK_FLAGS = FLAG_LINE_END  # block flags this reader knows
 
 ###############################################################################
 # Low‑level encode / decode working on *str*  →  *bytes* and vice‑versa.
@@ -25,7 +46,10 @@ def encode(text: str) -> bytes:
     if not text:
         return b""
 
-    data = text.encode("utf-8")  # 🔹 convert to bytes first
+    return _encode_bytes(text.encode("utf-8"))  # 🔹 convert to bytes first
+
+
+def _encode_bytes(data: bytes) -> bytes:
     out = bytearray()
     prev = data[0]
     count = 1
@@ -47,11 +71,102 @@ def decode(buf: bytes) -> str:
     if len(buf) % 2 != 0:
         raise ValueError("Corrupted RLE stream length")
 
+    return _expand(buf).decode("utf-8")
+
+
+def _iter_raw(f: BinaryIO) -> Iterator[bytes]:
+    """Yield raw chunks from an open RLE archive (v1 or v2).
+
+    Version‑2 blocks are checked against their CRC; version 1 carries no
+    checksum, so only the stream structure can be validated."""
+    if f.read(4) != _MAGIC:
+        raise ValueError("Not an RLE archive")
+    version = int.from_bytes(f.read(1), "little")
+    if version == 1:
+        payload = f.read()
+        if len(payload) % 2 != 0:
+            raise CorruptArchiveError("Corrupted RLE stream length", 0)
+        yield _expand(payload)
+        return
+    if version != _VERSION:
+        raise ValueError("Unsupported RLE version")
+    for block in iter_blocks(f, 5, BLOCK_FLAGS):
+        yield decode_block(block)
+
+
+def decode_block(block: Block) -> bytes:
+    """Expand and CRC‑check one v2 block."""
+    block.require(BLOCK_FLAGS)
+    if len(block.payload) % 2 != 0:
+        raise CorruptArchiveError("Corrupted RLE stream length", block.offset)
+    raw = _expand(block.payload)
+    block.check(raw)
+    return raw
+
+
+def block_symbols(block: Block) -> FrozenSet[int]:
+    """Return the byte values present in *block* (every second payload byte)."""
+    block.require(BLOCK_FLAGS)
+    if len(block.payload) % 2 != 0:
+        raise CorruptArchiveError("Corrupted RLE stream length", block.offset)
+    return frozenset(block.payload[1::2])
+
+
+def _expand(payload: bytes) -> bytes:
     out = bytearray()
-    it = iter(buf)
+    it = iter(payload)
     for count, value in zip(it, it):
         out.extend([value] * count)
-    return out.decode("utf-8")
+    return bytes(out)
+
+
+def _write_archive(f: BinaryIO, data: bytes) -> int:
+    """Write header + blocks for *data* to *f*; return the bytes written."""
+    f.write(_MAGIC)
+    f.write(_VERSION.to_bytes(1, "little"))
+    size = 5
+    for chunk in split_blocks(data):
+        size += write_block(f, chunk, _encode_bytes(chunk))
+    return size
+
+
+def append(f: BinaryIO, data: bytes) -> int:
+    """Append *data* to the archive open in *f* (mode ``"r+b"``) as new blocks.
+
+    Only the header is read, and an empty file gets one; returns the number
+    of bytes added."""
+    header = f.read(5)
+    if header:
+        if len(header) != 5 or header[:4] != _MAGIC:
+            raise ValueError("Not an RLE archive")
+        version = header[4]
+        if version == 1:
+            raise ValueError(
+                "Cannot append to a version‑1 archive; recompress it first"
+            )
+        if version != _VERSION:
+            raise ValueError("Unsupported RLE version")
+    f.seek(0, io.SEEK_END)
+    size = 0
+    if not header and data:
+        f.write(_MAGIC)
+        f.write(_VERSION.to_bytes(1, "little"))
+        size = 5
+    for chunk in split_blocks(data):
+        size += write_block(f, chunk, _encode_bytes(chunk))
+    return size
+
+
+def verify(f: BinaryIO) -> Tuple[int, int]:
+    """Check every block of the archive open in *f* without keeping its output.
+
+    Returns ``(blocks, raw_bytes)``; raises :class:`CorruptArchiveError` at the
+    first corrupted block."""
+    blocks = size = 0
+    for raw in _iter_raw(f):
+        blocks += 1
+        size += len(raw)
+    return blocks, size
 
 
 ###############################################################################
@@ -64,37 +179,62 @@ class RLECompressor:
 
     def compress(self, in_path: Path, out_path: Path) -> Stats:
         timer = Timer()
-        text = Path(in_path).read_text(encoding="utf-8")
-        payload = encode(text)
+        data = Path(in_path).read_text(encoding="utf-8").encode("utf-8")
 
         with open(out_path, "wb") as f:
-            f.write(_MAGIC)
-            f.write(_VERSION.to_bytes(1, "little"))
-            f.write(payload)
+            comp_size = _write_archive(f, data)
 
         return Stats(
-            orig_size=len(text.encode("utf-8")),
-            comp_size=len(payload) + 5,
-            ratio=(len(payload) + 5) / len(text.encode("utf-8")),
+            orig_size=len(data),
+            comp_size=comp_size,
+            ratio=comp_size / len(data) if data else 0,
             time_sec=timer.elapsed(),
         )
 
     def decompress(self, in_path: Path, out_path: Path) -> Stats:
         timer = Timer()
         with open(in_path, "rb") as f:
-            header = f.read(4)
-            if header != _MAGIC:
-                raise ValueError("Not an RLE archive")
-            version = int.from_bytes(f.read(1), "little")
-            if version != _VERSION:
-                raise ValueError("Unsupported RLE version")
-            payload = f.read()
-
-        text = decode(payload)
-        Path(out_path).write_text(text, encoding="utf-8")
+            data = b"".join(_iter_raw(f))
+
+        Path(out_path).write_text(data.decode("utf-8"), encoding="utf-8")
+        comp_size = Path(in_path).stat().st_size
+        return Stats(
+            orig_size=len(data),
+            comp_size=comp_size,
+            ratio=comp_size / len(data) if data else 0,
+            time_sec=timer.elapsed(),
+        )
+
+    def append(self, in_path: Path, out_path: Path) -> Stats:
+        """Add the contents of *in_path* to the end of archive *out_path*."""
+        timer = Timer()
+        data = Path(in_path).read_text(encoding="utf-8").encode("utf-8")
+        with open(out_path, "r+b") as f:
+            added = append(f, data)
+        return Stats(
+            orig_size=len(data),
+            comp_size=added,
+            ratio=added / len(data) if data else 0,
+            time_sec=timer.elapsed(),
+        )
+
+    def compress_bytes(self, data: bytes) -> bytes:
+        """Return a complete archive (header included) for UTF‑8 *data*."""
+        out = io.BytesIO()
+        _write_archive(out, data)
+        return out.getvalue()
+
+    def decompress_bytes(self, blob: bytes) -> bytes:
+        return b"".join(_iter_raw(io.BytesIO(blob)))
+
+    def verify(self, in_path: Path) -> Stats:
+        timer = Timer()
+        with open(in_path, "rb") as f:
+            _, size = verify(f)
+        comp_size = Path(in_path).stat().st_size
         return Stats(
-            orig_size=len(text.encode("utf-8")),
-            comp_size=len(payload) + 5,
-            ratio=(len(payload) + 5) / len(text.encode("utf-8")),
+            orig_size=size,
+            comp_size=comp_size,
+            ratio=comp_size / size if size else 0,
             time_sec=timer.elapsed(),
         )
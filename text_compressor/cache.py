@@ -0,0 +1,121 @@
+############################################
+# text_compressor/cache.py
+############################################
+"""Content‑addressed on‑disk cache of compressed outputs.
+
+Entries are keyed by a BLAKE2b digest of the input bytes, the algorithm name
+and ``FORMAT_VERSION``, which must be bumped whenever any compressor starts
+writing different bytes for the same input – otherwise old archives would be
+served from the cache.
+Writes are atomic (temp file + ``os.replace``) and the directory is kept under
+``max_bytes`` by evicting the least‑recently‑used entries; a hit refreshes the
+entry's mtime, which is what eviction orders by.  The running total size is
+kept in a small index file, so the directory is only scanned when a write may
+cross the limit (or every ``_RESCAN_PUTS`` writes, to correct drift from
+concurrent writers).
+"""
+from __future__ import annotations
+
+import hashlib
+import os
+from pathlib import Path
+import tempfile
+from typing import Optional, Tuple
+
+__all__ = ["ResultCache", "DEFAULT_MAX_BYTES", "FORMAT_VERSION"]
+
+DEFAULT_MAX_BYTES = 256 * 1024 * 1024
+# Output‑format generation covered by cache keys:
+#   1 – block‑framed v2 archives
+#   2 – blocks flagged FLAG_LINE_END
+#   3 – FLAG_CODEPOINTS blocks
+FORMAT_VERSION = 3
+_SUFFIX = ".bin"
+_INDEX = ".size"  # "<total bytes> <puts since last scan>"
+_RESCAN_PUTS = 256
+
+
+class ResultCache:
+    """Size‑bounded LRU cache of compressed archives stored under *root*."""
+
+    def __init__(self, root: Path, max_bytes: int = DEFAULT_MAX_BYTES):
+        self.root = Path(root)
+        self.max_bytes = max_bytes
+        self.root.mkdir(parents=True, exist_ok=True)
+
+    @staticmethod
+    def key(data: bytes, algo: str) -> str:
+        h = hashlib.blake2b(digest_size=20)
+        h.update(f"{algo}\0{FORMAT_VERSION}\0".encode("ascii"))
+        h.update(data)
+        return h.hexdigest()
+
+    def _path(self, key: str) -> Path:
+        return self.root / (key + _SUFFIX)
+
+    def get(self, key: str) -> Optional[bytes]:
+        path = self._path(key)
+        try:
+            blob = path.read_bytes()
+        except FileNotFoundError:
+            return None
+        try:
+            os.utime(path)  # mark as most recently used
+        except FileNotFoundError:
+            pass  # evicted concurrently – the bytes we read are still valid
+        return blob
+
+    def put(self, key: str, blob: bytes) -> None:
+        path = self._path(key)
+        try:
+            replaced = path.stat().st_size
+        except FileNotFoundError:
+            replaced = 0
+        fd, tmp = tempfile.mkstemp(dir=self.root, prefix=".tmp-")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(blob)
+            os.replace(tmp, path)
+        except BaseException:
+            Path(tmp).unlink(missing_ok=True)
+            raise
+        index = self._read_index()
+        if index is not None:
+            total = index[0] - replaced + len(blob)
+            puts = index[1] + 1
+            if total <= self.max_bytes and puts < _RESCAN_PUTS:
+                self._write_index(total, puts)
+                return
+        self._write_index(self._evict(), 0)
+
+    def _read_index(self) -> Optional[Tuple[int, int]]:
+        try:
+            total, puts = (self.root / _INDEX).read_text(encoding="ascii").split()
+            return int(total), int(puts)
+        except (OSError, ValueError):
+            return None
+
+    def _write_index(self, total: int, puts: int) -> None:
+        try:
+            (self.root / _INDEX).write_text(f"{total} {puts}", encoding="ascii")
+        except OSError:
+            pass  # the next put scans the directory instead
+
+    def _evict(self) -> int:
+        """Drop least‑recently‑used entries until the cache fits; return its size."""
+        entries = []
+        total = 0
+        for path in self.root.glob("*" + _SUFFIX):
+            try:
+                st = path.stat()
+            except FileNotFoundError:
+                continue
+            entries.append((st.st_mtime, st.st_size, path))
+            total += st.st_size
+        entries.sort()
+        for _, size, path in entries:
+            if total <= self.max_bytes:
+                break
+            path.unlink(missing_ok=True)
+            total -= size
+        return total
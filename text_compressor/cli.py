@@ -4,79 +4,495 @@
 """Command‑line interface for Text‑Compressor."""
 from __future__ import annotations
 
+from contextlib import ExitStack
+import re
+import signal
 import sys
 from pathlib import Path
+from typing import BinaryIO
 
 import click
 
-from text_compressor.compressors import CompressorFactory
+# Only what a daemon‑forwarded call needs is imported here; codecs, search
+# and the result cache are imported where the work is done in‑process.
+from text_compressor.cache import DEFAULT_MAX_BYTES
+from text_compressor.client import Client, DaemonUnavailableError, default_socket_path
+
+_STDIO = "-"
+_PING_TIMEOUT = 5.0  # seconds a running daemon gets to prove it is responsive
+
+
+def _daemon(no_daemon: bool) -> Client | None:
+    """Return a client for a responsive ``serve`` daemon, or ``None``."""
+    client = None if no_daemon else Client.connect()
+    if client is None:
+        return None
+    try:
+        client.ping(_PING_TIMEOUT)
+    except (DaemonUnavailableError, ValueError) as exc:
+        client.close()
+        _daemon_failed(exc)
+        return None
+    return client
+
+
+def _daemon_failed(exc: Exception) -> None:
+    click.echo(f"Warning: {exc} – working in‑process.", err=True)
 
 
 @click.group(context_settings={"help_option_names": ["-h", "--help"]})
 def cli() -> None:
-    """Lossless text compression using RLE or Huffman coding."""
+    """Lossless text compression using RLE or (static / adaptive) Huffman coding."""
 
 
 @cli.command()
-@click.argument("input", type=click.Path(exists=True, path_type=Path))
-@click.argument("output", type=click.Path(path_type=Path))
+@click.argument("input", type=click.Path(exists=True, allow_dash=True, path_type=Path))
+@click.argument("output", type=click.Path(allow_dash=True, path_type=Path))
 @click.option(
     "--algo",
     "-a",
     default="huffman",
     show_default=True,
-    type=click.Choice(["rle", "huffman"], case_sensitive=False),
-    help="Compression algorithm to use.",
+    type=click.Choice(
+        ["rle", "huffman", "huffman-unicode", "adaptive"], case_sensitive=False
+    ),
+    help="Compression algorithm to use (huffman-unicode = code‑point alphabet for "
+    "non‑Latin text, adaptive = single‑pass, for pipes).",
 )
 @click.option("--force", "-f", is_flag=True, help="Overwrite OUTPUT if it exists.")
+@click.option(
+    "--append",
+    "append",
+    is_flag=True,
+    help="Add INPUT to the existing OUTPUT archive as new blocks.",
+)
+@click.option(
+    "--cache-dir",
+    type=click.Path(file_okay=False, path_type=Path),
+    envvar="TEXT_COMPRESSOR_CACHE_DIR",
+    help="Reuse compressed outputs of identical inputs from this directory.",
+)
+@click.option(
+    "--cache-size",
+    default=DEFAULT_MAX_BYTES // (1024 * 1024),
+    show_default=True,
+    type=click.IntRange(min=0),
+    help="Cache size limit in MiB; least‑recently‑used entries are evicted.",
+)
+@click.option(
+    "--no-daemon",
+    is_flag=True,
+    help="Work in this process even if a `serve` daemon is running.",
+)
 @click.option(
     "--verbose", "-v", is_flag=True, help="Print statistics after completion."
 )
-def compress(input: Path, output: Path, algo: str, force: bool, verbose: bool):
-    """Compress INPUT file and write to OUTPUT."""
+def compress(
+    input: Path,
+    output: Path,
+    algo: str,
+    force: bool,
+    append: bool,
+    cache_dir: Path | None,
+    cache_size: int,
+    no_daemon: bool,
+    verbose: bool,
+):
+    """Compress INPUT file and write to OUTPUT ("-" for stdin / stdout)."""
+    if _STDIO in (str(input), str(output)):
+        _compress_stdio(
+            input,
+            output,
+            algo,
+            force,
+            append,
+            cache_dir,
+            cache_size,
+            no_daemon,
+            verbose,
+        )
+        return
+
+    if append and output.exists():
+        _append(input, output, algo, no_daemon, verbose)
+        return
+
     if output.exists() and not force:
         click.echo("Error: OUTPUT exists – use --force to overwrite.", err=True)
         sys.exit(1)
 
-    comp = CompressorFactory.get(algo)
-    comp.compress(input, output)
+    stats = None
+    try:
+        client = _daemon(no_daemon)
+        if client is not None:
+            with client:
+                try:
+                    stats = client.compress(
+                        input, output, algo, cache_dir, cache_size * 1024 * 1024
+                    )
+                except DaemonUnavailableError as exc:
+                    _daemon_failed(exc)
+        if stats is None:
+            from text_compressor.cache import ResultCache
+            from text_compressor.compressors import CompressorFactory
+
+            limit = cache_size * 1024 * 1024
+            cache = ResultCache(cache_dir, limit) if cache_dir else None
+            comp = CompressorFactory.get(algo, cache=cache)
+            stats = comp.compress(input, output)
+    except ValueError as exc:
+        click.echo(f"Error: {exc}", err=True)
+        sys.exit(2)
 
     if verbose:
         ratio = (
             output.stat().st_size / input.stat().st_size if input.stat().st_size else 0
         )
+        hit = " [cache hit]" if stats.cache_hit else ""
+        click.echo(
+            f"Done. {input.stat().st_size} → {output.stat().st_size} bytes (ratio {ratio:.2f}){hit}."
+        )
+
+
+def _open_stdio(stack: ExitStack, path: Path, mode: str) -> BinaryIO:
+    if str(path) == _STDIO:
+        return sys.stdin.buffer if "r" in mode else sys.stdout.buffer
+    return stack.enter_context(open(path, mode))
+
+
+def _compress_stdio(
+    input: Path,
+    output: Path,
+    algo: str,
+    force: bool,
+    append: bool,
+    cache_dir: Path | None,
+    cache_size: int,
+    no_daemon: bool,
+    verbose: bool,
+):
+    """Implementation of ``compress`` when INPUT or OUTPUT is "-".
+
+    The adaptive coder streams as data arrives, in‑process and uncached, and
+    appends to an OUTPUT file by adding a member; the block coders read all of
+    their input first and cannot append from a pipe."""
+    mode = "wb"
+    if append and str(output) == _STDIO:
+        click.echo("Error: --append needs an OUTPUT file, not stdout.", err=True)
+        sys.exit(1)
+    if append and output.exists():
+        algo = _append_algo(output, algo)[0]
+        if algo != "adaptive":
+            click.echo(
+                f"Error: cannot append to a {algo} archive from stdin – "
+                "use an adaptive archive or an INPUT file.",
+                err=True,
+            )
+            sys.exit(1)
+        mode = "ab"
+    elif str(output) != _STDIO and output.exists() and not force:
+        click.echo("Error: OUTPUT exists – use --force to overwrite.", err=True)
+        sys.exit(1)
+
+    source = click.get_current_context().get_parameter_source("cache_dir")
+    if algo == "adaptive" and source is click.core.ParameterSource.COMMANDLINE:
+        click.echo("Error: --cache-dir does not apply to streamed output.", err=True)
+        sys.exit(1)
+
+    with ExitStack() as stack:
+        src = _open_stdio(stack, input, "rb")
+        dst = _open_stdio(stack, output, mode)
+        try:
+            if algo == "adaptive":
+                raw, size = _stream_adaptive(src, dst)
+            else:
+                data = src.read()
+                blob = _compress_bytes(data, algo, cache_dir, cache_size, no_daemon)
+                dst.write(blob)
+                raw, size = len(data), len(blob)
+        except ValueError as exc:
+            click.echo(f"Error: {exc}", err=True)
+            sys.exit(2)
+    if verbose:
+        click.echo(f"Done. {raw} → {size} bytes.", err=True)
+
+
+class _Terminated(KeyboardInterrupt):
+    """SIGTERM, raised like Ctrl‑C so the open member is finished."""
+
+
+def _on_sigterm(signum, frame):
+    raise _Terminated
+
+
+def _stream_adaptive(src: BinaryIO, dst: BinaryIO) -> tuple[int, int]:
+    """Stream *src* through the adaptive coder, closing a member at bounded
+    intervals; on Ctrl‑C or SIGTERM finish the open member and exit."""
+    from text_compressor.algorithms import adaptive
+
+    previous = signal.signal(signal.SIGTERM, _on_sigterm)
+    try:
+        return adaptive.compress_stream(
+            src, dst, adaptive.MEMBER_BYTES, adaptive.MEMBER_SECONDS
+        )
+    except KeyboardInterrupt as exc:
+        sys.exit(
+            128 + (signal.SIGTERM if isinstance(exc, _Terminated) else signal.SIGINT)
+        )
+    finally:
+        signal.signal(signal.SIGTERM, previous)
+
+
+def _compress_bytes(
+    data: bytes, algo: str, cache_dir: Path | None, cache_size: int, no_daemon: bool
+) -> bytes:
+    limit = cache_size * 1024 * 1024
+    client = _daemon(no_daemon)
+    if client is not None:
+        with client:
+            try:
+                return client.compress_bytes(data, algo, cache_dir, limit)
+            except DaemonUnavailableError as exc:
+                _daemon_failed(exc)
+    from text_compressor.cache import ResultCache
+    from text_compressor.compressors import CompressorFactory
+
+    cache = ResultCache(cache_dir, limit) if cache_dir else None
+    return CompressorFactory.get(algo, cache=cache).compress_bytes(data)
+
+
+def _append_algo(output: Path, algo: str) -> tuple[str, str | None]:
+    """Return ``(archive algorithm, explicitly requested algorithm or None)``
+    for ``--append`` onto *output*, exiting if they conflict."""
+    from text_compressor.compressors import archive_format, detect_algo
+
+    if output.stat().st_size:
+        archive_algo = detect_algo(output)
+    else:
+        archive_algo = archive_format(algo)
+    if archive_algo is None:
+        click.echo("Error: Unsupported or corrupted archive.", err=True)
+        sys.exit(2)
+    source = click.get_current_context().get_parameter_source("algo")
+    requested = algo if source is click.core.ParameterSource.COMMANDLINE else None
+    if requested and archive_format(requested) != archive_algo:
+        click.echo(f"Error: OUTPUT is a {archive_algo} archive, not {algo}.", err=True)
+        sys.exit(1)
+    return archive_algo, requested
+
+
+def _append(input: Path, output: Path, algo: str, no_daemon: bool, verbose: bool):
+    """Implementation of ``compress --append`` for an existing OUTPUT."""
+    requested = _append_algo(output, algo)[1]
+
+    stats = None
+    try:
+        client = _daemon(no_daemon)
+        if client is not None:
+            with client:
+                try:
+                    stats = client.append(input, output, requested)
+                except DaemonUnavailableError as exc:
+                    # A worker of a killed daemon may still be writing OUTPUT,
+                    # so neither roll back nor append again in‑process.
+                    click.echo(
+                        f"Error: {exc} – {output} may hold part of the appended "
+                        "data; check it with `text-compressor test`.",
+                        err=True,
+                    )
+                    sys.exit(2)
+        if stats is None:
+            from text_compressor.compressors import append as append_archive
+
+            stats = append_archive(input, output, requested)
+    except ValueError as exc:
+        click.echo(f"Error: {exc}", err=True)
+        sys.exit(2)
+
+    if verbose:
         click.echo(
-            f"Done. {input.stat().st_size} → {output.stat().st_size} bytes (ratio {ratio:.2f})."
+            f"Appended {stats.orig_size} → {stats.comp_size} bytes "
+            f"(archive now {output.stat().st_size} bytes)."
         )
 
 
 @cli.command()
-@click.argument("input", type=click.Path(exists=True, path_type=Path))
-@click.argument("output", type=click.Path(path_type=Path))
+@click.argument("input", type=click.Path(exists=True, allow_dash=True, path_type=Path))
+@click.argument("output", type=click.Path(allow_dash=True, path_type=Path))
 @click.option("--force", "-f", is_flag=True, help="Overwrite OUTPUT if it exists.")
+@click.option(
+    "--no-daemon",
+    is_flag=True,
+    help="Work in this process even if a `serve` daemon is running.",
+)
 @click.option(
     "--verbose", "-v", is_flag=True, help="Print statistics after completion."
 )
-def decompress(input: Path, output: Path, force: bool, verbose: bool):
-    """Decompress INPUT archive to OUTPUT text file."""
+def decompress(input: Path, output: Path, force: bool, no_daemon: bool, verbose: bool):
+    """Decompress INPUT archive to OUTPUT text file ("-" for stdin / stdout)."""
+    if _STDIO in (str(input), str(output)):
+        _decompress_stdio(input, output, force, verbose)
+        return
+
     if output.exists() and not force:
         click.echo("Error: OUTPUT exists – use --force to overwrite.", err=True)
         sys.exit(1)
 
-    # Detect algo from header
-    with input.open("rb") as f:
-        magic = f.read(4)
-    algo = "rle" if magic == b"RLE1" else "huffman" if magic == b"HUF1" else None
-    if algo is None:
-        click.echo("Error: Unsupported or corrupted archive.", err=True)
-        sys.exit(2)
+    done = False
+    try:
+        client = _daemon(no_daemon)
+        if client is not None:
+            with client:
+                try:
+                    client.decompress(input, output)
+                    done = True
+                except DaemonUnavailableError as exc:
+                    _daemon_failed(exc)
+        if not done:
+            from text_compressor.compressors import CompressorFactory, detect_algo
 
-    comp = CompressorFactory.get(algo)
-    comp.decompress(input, output)
+            # Detect algo from header
+            algo = detect_algo(input)
+            if algo is None:
+                raise ValueError("Unsupported or corrupted archive")
+            comp = CompressorFactory.get(algo)
+            comp.decompress(input, output)
+    except ValueError as exc:
+        click.echo(f"Error: {exc}", err=True)
+        sys.exit(2)
 
     if verbose:
         click.echo(f"Restored {output.stat().st_size} bytes.")
 
 
+def _decompress_stdio(input: Path, output: Path, force: bool, verbose: bool):
+    """Implementation of ``decompress`` when INPUT or OUTPUT is "-"."""
+    from text_compressor.algorithms import adaptive
+    from text_compressor.compressors import CompressorFactory, detect_algo_bytes
+
+    if str(output) != _STDIO and output.exists() and not force:
+        click.echo("Error: OUTPUT exists – use --force to overwrite.", err=True)
+        sys.exit(1)
+    with ExitStack() as stack:
+        src = _open_stdio(stack, input, "rb")
+        head = src.read(5)
+        algo = detect_algo_bytes(head)
+        if algo is None:
+            click.echo("Error: Unsupported or corrupted archive.", err=True)
+            sys.exit(2)
+        dst = _open_stdio(stack, output, "wb")
+        try:
+            if algo == "adaptive":
+                size = adaptive.decompress_stream(src, dst, head)
+            else:
+                raw = CompressorFactory.get(algo).decompress_bytes(head + src.read())
+                dst.write(raw)
+                size = len(raw)
+        except ValueError as exc:
+            click.echo(f"Error: {exc}", err=True)
+            sys.exit(2)
+    if verbose:
+        click.echo(f"Restored {size} bytes.", err=True)
+
+
+@cli.command()
+@click.argument("input", type=click.Path(exists=True, path_type=Path))
+@click.option(
+    "--verbose", "-v", is_flag=True, help="Print statistics after completion."
+)
+def test(input: Path, verbose: bool):
+    """Check the integrity of INPUT archive without writing any output."""
+    from text_compressor.compressors import verify
+    from text_compressor.utils.blocks import CorruptArchiveError
+
+    try:
+        stats = verify(input)
+    except CorruptArchiveError as exc:
+        click.echo(
+            f"Error: {input}: block at offset {exc.offset} is corrupted.", err=True
+        )
+        sys.exit(3)
+    except ValueError as exc:
+        click.echo(f"Error: {input}: {exc}.", err=True)
+        sys.exit(2)
+
+    if verbose:
+        click.echo(f"{input}: OK ({stats.orig_size} bytes, {stats.time_sec:.3f}s).")
+    else:
+        click.echo(f"{input}: OK")
+
+
+@cli.command()
+@click.argument("pattern")
+@click.argument("input", type=click.Path(exists=True, path_type=Path))
+@click.option(
+    "--fixed-strings", "-F", is_flag=True, help="Treat PATTERN as a literal string."
+)
+@click.option("--ignore-case", "-i", is_flag=True, help="Match case‑insensitively.")
+@click.option(
+    "--jobs",
+    "-j",
+    type=click.IntRange(min=1),
+    default=None,
+    help="Worker processes decoding blocks [default: CPU count].",
+)
+def grep(
+    pattern: str,
+    input: Path,
+    fixed_strings: bool,
+    ignore_case: bool,
+    jobs: int | None,
+):
+    """Print lines of INPUT archive matching PATTERN, prefixed by their offset."""
+    from text_compressor.search import grep as search_archive
+    from text_compressor.utils.blocks import CorruptArchiveError
+
+    found = False
+    try:
+        for match in search_archive(
+            pattern, input, fixed=fixed_strings, ignore_case=ignore_case, jobs=jobs
+        ):
+            found = True
+            line = match.line.decode("utf-8", errors="replace")
+            click.echo(f"{match.offset}:{line}")
+    except CorruptArchiveError as exc:
+        click.echo(
+            f"Error: {input}: block at offset {exc.offset} is corrupted.", err=True
+        )
+        sys.exit(3)
+    except (ValueError, re.error) as exc:
+        click.echo(f"Error: {exc}.", err=True)
+        sys.exit(2)
+    sys.exit(0 if found else 1)
+
+
+@cli.command()
+@click.option(
+    "--socket",
+    "socket_path",
+    type=click.Path(dir_okay=False, path_type=Path),
+    default=None,
+    help="Unix socket to listen on [default: $TEXT_COMPRESSOR_SOCKET or a per‑user runtime path].",
+)
+@click.option(
+    "--workers",
+    "-j",
+    type=click.IntRange(min=1),
+    default=None,
+    help="Worker processes [default: CPU count].",
+)
+def serve(socket_path: Path | None, workers: int | None):
+    """Run a compression daemon that compress/decompress forward to."""
+    from text_compressor.server import serve as run_daemon
+
+    path = socket_path or default_socket_path()
+    click.echo(f"Listening on {path} (Ctrl‑C to stop).", err=True)
+    try:
+        run_daemon(path, workers)
+    except OSError as exc:
+        click.echo(f"Error: {exc}", err=True)
+        sys.exit(1)
+
+
 if __name__ == "__main__":
     cli()
@@ -0,0 +1,231 @@
+############################################
+# text_compressor/client.py
+############################################
+"""Thin client for the ``serve`` daemon and the frame format both sides use.
+
+This module deliberately imports no compressor code, so a CLI call that
+forwards its work to a running daemon skips loading the codecs entirely.  The
+wire protocol is described in :mod:`text_compressor.server`.
+"""
+from __future__ import annotations
+
+import getpass
+import json
+import os
+from pathlib import Path
+import socket
+import struct
+import tempfile
+from typing import Any, Dict, Optional, Tuple
+
+from text_compressor.cache import FORMAT_VERSION
+from text_compressor.utils.stats import Stats
+
+__all__ = [
+    "Client",
+    "DaemonUnavailableError",
+    "PROTOCOL_VERSION",
+    "default_socket_path",
+]
+
+# Bump whenever an op, header field or algorithm name changes meaning; a
+# daemon answering ping with another protocol (or cache FORMAT_VERSION) is
+# left alone and the CLI works in‑process.  Daemons before version 2 do not
+# report one.
+PROTOCOL_VERSION = 2
+
+_PREFIX = struct.Struct(">IQ")
+_PEERCRED = struct.Struct("3i")  # struct ucred: pid, uid, gid
+
+Header = Dict[str, Any]
+
+
+def default_socket_path() -> Path:
+    """``$TEXT_COMPRESSOR_SOCKET``, else a per‑user path in the runtime dir."""
+    env = os.environ.get("TEXT_COMPRESSOR_SOCKET")
+    if env:
+        return Path(env)
+    runtime = os.environ.get("XDG_RUNTIME_DIR")
+    if runtime:
+        return Path(runtime) / "text-compressor.sock"
+    return Path(tempfile.gettempdir()) / f"text-compressor-{getpass.getuser()}.sock"
+
+
+class DaemonUnavailableError(ConnectionError):
+    """The daemon accepted a connection but did not complete a request."""
+
+
+# ---------------------------------------------------------------------------
+# Framing
+# ---------------------------------------------------------------------------
+
+
+def _recv_exact(sock: socket.socket, n: int) -> bytes:
+    buf = bytearray()
+    while len(buf) < n:
+        chunk = sock.recv(min(n - len(buf), 1 << 20))
+        if not chunk:
+            raise EOFError(
+                "Connection closed mid‑frame" if buf else "Connection closed"
+            )
+        buf.extend(chunk)
+    return bytes(buf)
+
+
+def _send(sock: socket.socket, header: Header, body: bytes = b"") -> None:
+    raw = json.dumps(header).encode("utf-8")
+    sock.sendall(_PREFIX.pack(len(raw), len(body)) + raw)
+    if body:
+        sock.sendall(body)
+
+
+def _recv(sock: socket.socket) -> Tuple[Header, bytes]:
+    header_len, body_len = _PREFIX.unpack(_recv_exact(sock, _PREFIX.size))
+    header = json.loads(_recv_exact(sock, header_len))
+    return header, _recv_exact(sock, body_len)
+
+
+def _peer_uid(sock: socket.socket, path: Path) -> int:
+    """Return the uid of the process (or, failing that, the socket file's
+    owner) at the other end of *sock*."""
+    if hasattr(socket, "SO_PEERCRED"):
+        creds = sock.getsockopt(socket.SOL_SOCKET, socket.SO_PEERCRED, _PEERCRED.size)
+        return _PEERCRED.unpack(creds)[1]
+    return os.stat(path).st_uid
+
+
+# ---------------------------------------------------------------------------
+# Client
+# ---------------------------------------------------------------------------
+
+
+class Client:
+    """Blocking client for :class:`~text_compressor.server.DaemonServer`; one
+    connection per instance."""
+
+    def __init__(self, sock: socket.socket):
+        self._sock = sock
+
+    @classmethod
+    def connect(cls, path: Optional[Path] = None) -> Optional["Client"]:
+        """Return a connected client, or ``None`` if no daemon of this user
+        is listening.
+
+        A socket owned by another user is ignored: it could have been created
+        in a shared temp dir to receive our input data."""
+        if not hasattr(socket, "AF_UNIX"):
+            return None
+        path = Path(path or default_socket_path())
+        sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        try:
+            sock.connect(str(path))
+            if hasattr(os, "getuid") and _peer_uid(sock, path) != os.getuid():
+                sock.close()
+                return None
+        except OSError:
+            sock.close()
+            return None
+        return cls(sock)
+
+    def close(self) -> None:
+        self._sock.close()
+
+    def __enter__(self) -> "Client":
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+        return False
+
+    def request(self, header: Header, body: bytes = b"") -> Tuple[Header, bytes]:
+        """Send one request and return the response.
+
+        Raises :class:`DaemonUnavailableError` if the connection fails or the
+        response is malformed, and ``ValueError`` if the daemon reports an
+        error."""
+        try:
+            _send(self._sock, header, body)
+            resp, out = _recv(self._sock)
+        except (OSError, EOFError, ValueError) as exc:
+            raise DaemonUnavailableError(f"Daemon request failed: {exc}") from exc
+        if not resp.get("ok"):
+            raise ValueError(resp.get("error", "Daemon request failed"))
+        return resp, out
+
+    def ping(self, timeout: Optional[float] = None) -> None:
+        """Round‑trip through a worker; raise if it takes over *timeout* seconds.
+
+        Raises :class:`DaemonUnavailableError` as well if the daemon runs a
+        different version of text‑compressor."""
+        self._sock.settimeout(timeout)
+        try:
+            resp, _ = self.request({"op": "ping"})
+        finally:
+            self._sock.settimeout(None)
+        theirs = (resp.get("protocol"), resp.get("format"))
+        if theirs != (PROTOCOL_VERSION, FORMAT_VERSION):
+            raise DaemonUnavailableError(
+                f"Daemon speaks protocol {theirs[0]} / format {theirs[1]}, not "
+                f"{PROTOCOL_VERSION} / {FORMAT_VERSION} (restart `serve`)"
+            )
+
+    def compress(
+        self,
+        in_path: Path,
+        out_path: Path,
+        algo: str = "huffman",
+        cache_dir: Optional[Path] = None,
+        cache_size: Optional[int] = None,
+    ) -> Stats:
+        header: Header = {
+            "op": "compress",
+            "algo": algo,
+            "input": str(Path(in_path).resolve()),
+            "output": str(Path(out_path).resolve()),
+        }
+        _add_cache(header, cache_dir, cache_size)
+        resp, _ = self.request(header)
+        return Stats(**resp["stats"])
+
+    def decompress(self, in_path: Path, out_path: Path) -> Stats:
+        resp, _ = self.request(
+            {
+                "op": "decompress",
+                "input": str(Path(in_path).resolve()),
+                "output": str(Path(out_path).resolve()),
+            }
+        )
+        return Stats(**resp["stats"])
+
+    def append(self, in_path: Path, archive: Path, algo: Optional[str] = None) -> Stats:
+        header: Header = {
+            "op": "append",
+            "input": str(Path(in_path).resolve()),
+            "output": str(Path(archive).resolve()),
+        }
+        if algo:
+            header["algo"] = algo
+        resp, _ = self.request(header)
+        return Stats(**resp["stats"])
+
+    def compress_bytes(
+        self,
+        data: bytes,
+        algo: str = "huffman",
+        cache_dir: Optional[Path] = None,
+        cache_size: Optional[int] = None,
+    ) -> bytes:
+        header: Header = {"op": "compress", "algo": algo}
+        _add_cache(header, cache_dir, cache_size)
+        return self.request(header, data)[1]
+
+    def decompress_bytes(self, blob: bytes) -> bytes:
+        return self.request({"op": "decompress"}, blob)[1]
+
+
+def _add_cache(header: Header, cache_dir: Optional[Path], size: Optional[int]):
+    """Ask the daemon to use a cache; it applies its default *size* if unset."""
+    if cache_dir:
+        header["cache_dir"] = str(Path(cache_dir).resolve())
+        if size is not None:
+            header["cache_size"] = size
@@ -1,14 +1,28 @@
 ############################################
 # text_compressor/compressors.py
 ############################################
-"""Factory & common interface that unify RLE and Huffman compressors."""
+"""Factory & common interface that unify the RLE and Huffman compressors."""
 from __future__ import annotations
 
+from functools import partial
 from pathlib import Path
-from typing import Protocol, runtime_checkable
+from typing import Optional, Protocol, runtime_checkable
 
+from text_compressor.algorithms.adaptive import AdaptiveCompressor  # type: ignore
 from text_compressor.algorithms.rle import RLECompressor  # type: ignore
 from text_compressor.algorithms.huffman import HuffmanCompressor  # type: ignore
+from text_compressor.cache import ResultCache
+from text_compressor.utils.stats import Stats, Timer
+
+# algorithm names that write another algorithm's archive format
+_FORMATS = {"huffman-unicode": "huffman"}
+
+# 4‑byte archive tags → algorithm name
+_MAGICS = {
+    b"RLE1": "rle",
+    b"HUF1": "huffman",
+    b"AHF1": "adaptive",
+}
 
 
 @runtime_checkable
@@ -19,6 +33,63 @@ class Compressor(Protocol):
 
     def decompress(self, in_path: Path, out_path: Path) -> None: ...
 
+    def verify(self, in_path: Path) -> Stats: ...
+
+    def append(self, in_path: Path, out_path: Path) -> Stats: ...
+
+    def compress_bytes(self, data: bytes) -> bytes: ...
+
+    def decompress_bytes(self, blob: bytes) -> bytes: ...
+
+
+class CachedCompressor:
+    """Wrap a compressor so identical inputs are served from a ResultCache.
+
+    A hit copies the cached archive to the output and skips encoding."""
+
+    def __init__(self, inner: Compressor, algo: str, cache: ResultCache):
+        self.inner = inner
+        self.algo = algo
+        self.cache = cache
+
+    def compress(self, in_path: Path, out_path: Path) -> Stats:
+        data = Path(in_path).read_bytes()
+        key = self.cache.key(data, self.algo)
+        with Timer() as t:
+            blob = self.cache.get(key)
+        if blob is None:
+            stats = self.inner.compress(in_path, out_path)
+            self.cache.put(key, Path(out_path).read_bytes())
+            return stats
+        Path(out_path).write_bytes(blob)
+        return Stats(
+            len(data),
+            len(blob),
+            len(blob) / len(data) if data else 0,
+            t.elapsed(),
+            cache_hit=True,
+        )
+
+    def compress_bytes(self, data: bytes) -> bytes:
+        key = self.cache.key(data, self.algo)
+        blob = self.cache.get(key)
+        if blob is None:
+            blob = self.inner.compress_bytes(data)
+            self.cache.put(key, blob)
+        return blob
+
+    def decompress(self, in_path: Path, out_path: Path) -> Stats:
+        return self.inner.decompress(in_path, out_path)
+
+    def decompress_bytes(self, blob: bytes) -> bytes:
+        return self.inner.decompress_bytes(blob)
+
+    def verify(self, in_path: Path) -> Stats:
+        return self.inner.verify(in_path)
+
+    def append(self, in_path: Path, out_path: Path) -> Stats:
+        return self.inner.append(in_path, out_path)
+
 
 class CompressorFactory:
     """Return a compressor instance for the requested algorithm."""
@@ -26,11 +97,69 @@ class CompressorFactory:
     _registry = {
         "rle": RLECompressor,
         "huffman": HuffmanCompressor,
+        "huffman-unicode": partial(HuffmanCompressor, alphabet="codepoint"),
+        "adaptive": AdaptiveCompressor,
     }
 
     @classmethod
-    def get(cls, name: str) -> Compressor:
+    def get(cls, name: str, cache: Optional[ResultCache] = None) -> Compressor:
+        """Return a compressor for *name*; with *cache*, compress results are
+        looked up in (and stored to) that ResultCache."""
         key = name.lower()
         if key not in cls._registry:
             raise ValueError(f"Unsupported algorithm: {name}")
-        return cls._registry[key]()
+        comp = cls._registry[key]()
+        if cache is not None:
+            return CachedCompressor(comp, key, cache)
+        return comp
+
+
+def detect_algo(path: Path) -> Optional[str]:
+    """Return the algorithm that wrote the archive at *path*, or ``None``.
+
+    A 0‑byte file is the Huffman archive of empty input (what
+    ``huffman.encode("")`` returns), so it is reported as ``"huffman"``."""
+    with open(path, "rb") as f:
+        return detect_algo_bytes(f.read(4))
+
+
+def detect_algo_bytes(blob: bytes) -> Optional[str]:
+    """Like :func:`detect_algo` for an archive already held in memory."""
+    if not blob:
+        return "huffman"
+    return _MAGICS.get(bytes(blob[:4]))
+
+
+def verify(path: Path) -> Stats:
+    """Stream through the archive at *path*, checking every block's CRC.
+
+    Decoded data is discarded as it is produced, so memory use does not grow
+    with the archive size.  Raises
+    :class:`~text_compressor.utils.blocks.CorruptArchiveError` (a
+    ``ValueError``) at the first bad block; its ``offset`` attribute locates
+    the block inside the archive."""
+    algo = detect_algo(path)
+    if algo is None:
+        raise ValueError("Unsupported or corrupted archive")
+    return CompressorFactory.get(algo).verify(Path(path))
+
+
+def archive_format(algo: str) -> str:
+    """Return the archive format (as named by :func:`detect_algo`) *algo* writes."""
+    return _FORMATS.get(algo.lower(), algo.lower())
+
+
+def append(in_path: Path, archive: Path, algo: Optional[str] = None) -> Stats:
+    """Append the contents of *in_path* to *archive* as new self‑contained blocks.
+
+    The algorithm is taken from the archive's header unless *algo* names one
+    that writes the same format (e.g. ``huffman-unicode`` onto a Huffman
+    archive); the existing blocks are left untouched, so the cost is
+    proportional to the appended data."""
+    detected = detect_algo(archive) if Path(archive).stat().st_size else None
+    if detected is None and Path(archive).stat().st_size:
+        raise ValueError("Unsupported or corrupted archive")
+    if algo is not None and detected is not None and archive_format(algo) != detected:
+        raise ValueError(f"Archive is {detected}, not {algo}")
+    name = algo or detected or "huffman"
+    return CompressorFactory.get(name).append(Path(in_path), Path(archive))
@@ -0,0 +1,212 @@
+############################################
+# text_compressor/search.py
+############################################
+"""Line search inside compressed archives.
+
+Blocks are decoded as a stream – in parallel worker processes when ``jobs`` is
+above one – and matching lines are reported with their byte offset in the
+decompressed text.  Before decoding, a block is skipped when:
+
+* it cannot contain a required byte of the pattern – the block's symbol set
+  is read from what was stored at compress time (the Huffman tree, or the RLE
+  run values) without decoding any data, and
+* it starts and ends on a line boundary (``FLAG_LINE_END`` on this block and
+  the previous one), so no line is shared with a block that is searched.
+
+Required bytes are only derived from literal patterns (``fixed=True`` or a
+regex without metacharacters) matched case‑sensitively; anything else
+searches every block.  Adaptive Huffman streams have no blocks and are
+scanned sequentially as they decode.
+"""
+from __future__ import annotations
+
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor
+from dataclasses import dataclass
+import os
+from pathlib import Path
+import re
+from typing import Callable, Deque, FrozenSet, Iterator, List, Optional, Tuple
+
+from text_compressor.algorithms import adaptive, huffman, rle
+from text_compressor.compressors import CompressorFactory, detect_algo
+from text_compressor.utils.blocks import FLAG_LINE_END, Block, iter_blocks
+
+__all__ = ["Match", "grep"]
+
+_REGEX_META = set(".^$*+?{}[]\\|()")
+
+# algorithm → (decode_block, block_symbols, supported block flags)
+_BLOCK_OPS = {
+    "huffman": (huffman.decode_block, huffman.block_symbols, huffman.BLOCK_FLAGS),
+    "rle": (rle.decode_block, rle.block_symbols, rle.BLOCK_FLAGS),
+}
+
+# (first partial line or None, matches inside the block, trailing partial line)
+_BlockResult = Tuple[Optional[bytes], List[Tuple[int, bytes]], bytes]
+
+
+@dataclass(frozen=True)
+class Match:
+    offset: int  # byte offset of the line in the decompressed text
+    line: bytes  # without the trailing newline
+
+
+def _compile(pattern: str, fixed: bool, ignore_case: bool) -> re.Pattern:
+    raw = pattern.encode("utf-8")
+    flags = re.M | (re.I if ignore_case else 0)
+    return re.compile(re.escape(raw) if fixed else raw, flags)
+
+
+def _required(pattern: str, fixed: bool, ignore_case: bool) -> FrozenSet[int]:
+    if ignore_case or not (fixed or _REGEX_META.isdisjoint(pattern)):
+        return frozenset()
+    return frozenset(pattern.encode("utf-8"))
+
+
+def _search_lines(regex: re.Pattern, text: bytes, base: int) -> List[Tuple[int, bytes]]:
+    """Return ``(offset, line)`` for every line of *text* that *regex* matches."""
+    found = []
+    pos = 0
+    while True:
+        m = regex.search(text, pos)
+        if m is None:
+            return found
+        start = text.rfind(b"\n", 0, m.start()) + 1
+        end = text.find(b"\n", m.start())
+        if end == -1:
+            end = len(text)
+        line = text[start:end]
+        # a match may run across a newline – confirm against the line alone
+        if regex.search(line):
+            found.append((base + start, line))
+        pos = end + 1
+
+
+def _search_block(algo: str, block: Block, regex: re.Pattern) -> _BlockResult:
+    data = _BLOCK_OPS[algo][0](block)
+    first = data.find(b"\n")
+    if first == -1:
+        return None, [], data
+    last = data.rfind(b"\n")
+    body = data[first + 1 : last + 1]
+    return data[: first + 1], _search_lines(regex, body, first + 1), data[last + 1 :]
+
+
+def grep(
+    pattern: str,
+    archive: Path,
+    *,
+    fixed: bool = False,
+    ignore_case: bool = False,
+    jobs: Optional[int] = None,
+) -> Iterator[Match]:
+    """Yield the lines of *archive* that match *pattern*, in archive order.
+
+    *pattern* is a regular expression (or a literal with ``fixed=True``)
+    applied to the UTF‑8 bytes of each line.  ``jobs`` worker processes decode
+    blocks concurrently (default: CPU count; ``1`` searches in‑process).
+    Corrupted blocks raise :class:`~text_compressor.utils.blocks.CorruptArchiveError`.
+    """
+    regex = _compile(pattern, fixed, ignore_case)
+    algo = detect_algo(archive)
+    if algo is None:
+        raise ValueError("Unsupported or corrupted archive")
+
+    with open(archive, "rb") as f:
+        if algo == "adaptive":  # no blocks to skip: scan the decoded stream
+            yield from _grep_stream(adaptive.iter_decode(f), regex)
+            return
+        header = f.read(5)
+        if header[4:5] != b"\x02":  # pre‑block archives: one in‑memory pass
+            data = CompressorFactory.get(algo).decompress_bytes(header + f.read())
+            for offset, line in _search_lines(regex, data, 0):
+                yield Match(offset, line)
+            return
+        yield from _grep_blocks(
+            algo,
+            iter_blocks(f, len(header), _BLOCK_OPS[algo][2]),
+            regex,
+            _required(pattern, fixed, ignore_case),
+            jobs or os.cpu_count() or 1,
+        )
+
+
+def _grep_stream(chunks: Iterator[bytes], regex: re.Pattern) -> Iterator[Match]:
+    """Search decoded *chunks* in order, holding back only the last partial line."""
+    carry = b""
+    offset = 0  # raw offset of carry[0]
+    for chunk in chunks:
+        data = carry + chunk
+        last = data.rfind(b"\n")
+        if last == -1:
+            carry = data
+            continue
+        for rel, line in _search_lines(regex, data[: last + 1], 0):
+            yield Match(offset + rel, line)
+        carry = data[last + 1 :]
+        offset += last + 1
+    if carry and regex.search(carry):
+        yield Match(offset, carry)
+
+
+def _grep_blocks(
+    algo: str,
+    blocks: Iterator[Block],
+    regex: re.Pattern,
+    required: FrozenSet[int],
+    jobs: int,
+) -> Iterator[Match]:
+    symbols = _BLOCK_OPS[algo][1]
+    pool = ProcessPoolExecutor(max_workers=jobs) if jobs > 1 else None
+    pending: Deque[Tuple[int, int, Callable[[], Optional[_BlockResult]]]] = deque()
+    carry = b""  # partial line continued from previous blocks
+    carry_at = 0
+    offset = 0  # raw offset of the next block
+    prev_line_end = True
+    try:
+        blocks = iter(blocks)
+        exhausted = False
+        while pending or not exhausted:
+            # keep up to 4 blocks per worker in flight, in archive order
+            while not exhausted and len(pending) < 4 * jobs:
+                block = next(blocks, None)
+                if block is None:
+                    exhausted = True
+                    break
+                line_end = bool(block.flags & FLAG_LINE_END)
+                aligned = prev_line_end and line_end
+                if required and aligned and not required <= symbols(block):
+                    pending.append((offset, block.raw_len, lambda: None))
+                elif pool is not None:
+                    fut: Future = pool.submit(_search_block, algo, block, regex)
+                    pending.append((offset, block.raw_len, fut.result))
+                else:
+                    res = _search_block(algo, block, regex)
+                    pending.append((offset, block.raw_len, lambda res=res: res))
+                offset += block.raw_len
+                prev_line_end = line_end
+            if not pending:
+                break
+
+            base, raw_len, result = pending.popleft()
+            res = result()
+            if res is None:  # skipped: line‑aligned, so nothing is carried
+                continue
+            head, found, tail = res
+            if head is None:
+                if not carry:
+                    carry_at = base
+                carry += tail
+                continue
+            line = (carry + head)[:-1]
+            if regex.search(line):
+                yield Match(carry_at if carry else base, line)
+            for rel, text in found:
+                yield Match(base + rel, text)
+            carry, carry_at = tail, base + raw_len - len(tail)
+        if carry and regex.search(carry):
+            yield Match(carry_at, carry)
+    finally:
+        if pool is not None:
+            pool.shutdown(cancel_futures=True)
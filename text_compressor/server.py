@@ -0,0 +1,193 @@
+############################################
+# text_compressor/server.py
+############################################
+"""Local compression daemon.
+
+``text-compressor serve`` keeps a pool of warm worker processes behind a Unix
+domain socket, so short CLI invocations no longer pay for imports and cold
+Huffman table caches on every file.
+
+Wire protocol – every message, in either direction, is one frame:
+
+    +------------+------------+--------------+--------------+
+    | Header Len |  Body Len  | JSON Header  |     Body     |
+    |  4 bytes   |  8 bytes   |  var. bytes  |  var. bytes  |
+    +------------+------------+--------------+--------------+
+
+Requests carry ``{"op": "compress" | "decompress" | "append" | "ping", ...}``.
+With ``"input"``/``"output"`` paths the daemon works on files and returns
+their ``Stats`` (``append`` always takes paths); without them the body holds
+the input bytes and the response body holds the result.  Responses are
+``{"ok": true, ...}`` or ``{"ok": false, "error": "..."}``.  A connection may
+carry any number of request/response pairs.  A ``ping`` response reports the
+daemon's ``"protocol"`` and cache ``"format"`` versions; clients do not use a
+daemon whose versions differ from their own.
+
+The client lives in :mod:`text_compressor.client`, which imports no codecs.
+A client that loses its connection mid‑request raises
+:class:`~text_compressor.client.DaemonUnavailableError`; the CLI then does the
+work in‑process.  If a worker process dies the daemon answers the affected
+request with an error and replaces its pool.
+"""
+from __future__ import annotations
+
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from dataclasses import asdict
+import os
+from pathlib import Path
+import signal
+import socketserver
+import stat
+import threading
+from typing import Optional, Tuple
+
+from text_compressor.cache import DEFAULT_MAX_BYTES, FORMAT_VERSION, ResultCache
+from text_compressor.client import (
+    PROTOCOL_VERSION,
+    Client,
+    Header,
+    _recv,
+    _send,
+    default_socket_path,
+)
+from text_compressor.compressors import (
+    CompressorFactory,
+    append,
+    detect_algo,
+    detect_algo_bytes,
+)
+
+__all__ = ["DaemonServer", "serve"]
+
+
+# ---------------------------------------------------------------------------
+# Worker side (runs inside the process pool)
+# ---------------------------------------------------------------------------
+
+
+def _warm(_: int) -> None:
+    """Force imports in a freshly started worker."""
+
+
+def _dispatch(header: Header, body: bytes) -> Tuple[Header, bytes]:
+    try:
+        op = header.get("op")
+        if op == "ping":
+            return {
+                "ok": True,
+                "protocol": PROTOCOL_VERSION,
+                "format": FORMAT_VERSION,
+            }, b""
+        cache = None
+        if header.get("cache_dir"):
+            cache = ResultCache(
+                Path(header["cache_dir"]), header.get("cache_size", DEFAULT_MAX_BYTES)
+            )
+        if op == "compress":
+            comp = CompressorFactory.get(header.get("algo", "huffman"), cache=cache)
+            if "input" in header:
+                stats = comp.compress(Path(header["input"]), Path(header["output"]))
+                return {"ok": True, "stats": asdict(stats)}, b""
+            return {"ok": True}, comp.compress_bytes(body)
+        if op == "decompress":
+            if "input" in header:
+                algo = detect_algo(Path(header["input"]))
+            else:
+                algo = detect_algo_bytes(body)
+            if algo is None:
+                raise ValueError("Unsupported or corrupted archive")
+            comp = CompressorFactory.get(algo)
+            if "input" in header:
+                stats = comp.decompress(Path(header["input"]), Path(header["output"]))
+                return {"ok": True, "stats": asdict(stats)}, b""
+            return {"ok": True}, comp.decompress_bytes(body)
+        if op == "append":
+            stats = append(
+                Path(header["input"]), Path(header["output"]), header.get("algo")
+            )
+            return {"ok": True, "stats": asdict(stats)}, b""
+        raise ValueError(f"Unknown op: {op!r}")
+    except Exception as exc:  # reported to the client, never kills the worker
+        return {"ok": False, "error": f"{type(exc).__name__}: {exc}"}, b""
+
+
+# ---------------------------------------------------------------------------
+# Server
+# ---------------------------------------------------------------------------
+
+
+class _Handler(socketserver.BaseRequestHandler):
+    server: "DaemonServer"
+
+    def handle(self) -> None:
+        while True:
+            try:
+                header, body = _recv(self.request)
+            except (EOFError, ConnectionError, ValueError):
+                return
+            resp, out = self.server.run(header, body)
+            try:
+                _send(self.request, resp, out)
+            except OSError:
+                return
+
+
+class DaemonServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    """Threaded Unix‑socket server that hands work to a process pool."""
+
+    daemon_threads = True
+
+    def __init__(self, path: Path, workers: Optional[int] = None):
+        self.path = Path(path)
+        if os.path.lexists(self.path):
+            if not stat.S_ISSOCK(os.lstat(self.path).st_mode):
+                raise OSError(f"{self.path} exists and is not a socket")
+            probe = Client.connect(self.path)
+            if probe is not None:
+                probe.close()
+                raise OSError(f"A daemon is already listening on {self.path}")
+            self.path.unlink()  # stale socket from a crashed daemon
+        self.workers = workers or os.cpu_count() or 1
+        self.pool = ProcessPoolExecutor(max_workers=self.workers)
+        self._pool_lock = threading.Lock()
+        # spawn + import before serving
+        list(self.pool.map(_warm, range(self.workers)))
+        umask = os.umask(0o077)  # the socket is created owner‑only
+        try:
+            super().__init__(str(self.path), _Handler)
+        finally:
+            os.umask(umask)
+
+    def run(self, header: Header, body: bytes) -> Tuple[Header, bytes]:
+        """Execute one request in the pool, replacing the pool if it broke."""
+        pool = self.pool
+        try:
+            return pool.submit(_dispatch, header, body).result()
+        except BrokenProcessPool:
+            with self._pool_lock:
+                if self.pool is pool:  # first handler to notice replaces it
+                    self.pool = ProcessPoolExecutor(max_workers=self.workers)
+            pool.shutdown(wait=False)
+            return {"ok": False, "error": "A worker process died; retry"}, b""
+
+    def server_close(self) -> None:
+        super().server_close()
+        self.pool.shutdown(cancel_futures=True)
+        self.path.unlink(missing_ok=True)
+
+
+def _on_sigterm(signum, frame):
+    raise KeyboardInterrupt
+
+
+def serve(path: Optional[Path] = None, workers: Optional[int] = None) -> None:
+    """Run the daemon on *path* until interrupted (SIGINT or SIGTERM)."""
+    server = DaemonServer(path or default_socket_path(), workers)
+    signal.signal(signal.SIGTERM, _on_sigterm)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
@@ -0,0 +1,147 @@
+# utils/blocks.py
+"""Block framing shared by the version‑2 archive formats.
+
+A v2 archive is its 5‑byte header (tag + version) followed by any number of
+self‑delimiting blocks:
+
+    +-----------+-------------+---------+---------+-------------+
+    |  Raw Len  | Payload Len |  CRC32  |  Flags  |   Payload   |
+    |  4 bytes  |   4 bytes   | 4 bytes | 1 byte  | var. bytes  |
+    +-----------+-------------+---------+---------+-------------+
+
+* Lengths are big‑endian; the CRC is little‑endian (as in the v1 header) and
+  covers the block's *decoded* bytes.
+* Flags describe the block's contents; ``FLAG_LINE_END`` (bit 0) marks a
+  block whose raw bytes end with a newline, so no text line continues into
+  the next block, and ``FLAG_CODEPOINTS`` (bit 1) a Huffman block coded over
+  Unicode code points instead of bytes.  Other bits are reserved and written
+  as 0; readers reject blocks with bits they do not know, so an archive from a
+  newer writer is reported as unsupported rather than corrupted.
+
+Because every block carries its own lengths and checksum a reader can walk an
+archive one block at a time, in constant memory, and pinpoint the first
+corrupted block by its byte offset.
+"""
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import BinaryIO, Iterator
+import zlib
+
+__all__ = [
+    "BLOCK_SIZE",
+    "BLOCK_HEADER_SIZE",
+    "Block",
+    "CorruptArchiveError",
+    "FLAG_CODEPOINTS",
+    "FLAG_LINE_END",
+    "iter_blocks",
+    "split_blocks",
+    "write_block",
+]
+
+BLOCK_SIZE = 1 << 16  # 64 KiB of raw input per block
+BLOCK_HEADER_SIZE = 13
+
+FLAG_LINE_END = 0x01
+FLAG_CODEPOINTS = 0x02
+
+
+class CorruptArchiveError(ValueError):
+    """Raised when an archive fails an integrity check.
+
+    ``offset`` is the byte offset (from the start of the archive) of the block
+    that failed, so callers can report exactly where the damage starts."""
+
+    def __init__(self, message: str, offset: int):
+        super().__init__(f"{message} (block at offset {offset})")
+        self.message = message
+        self.offset = offset
+
+    def __reduce__(self):  # keep *offset* across process boundaries
+        return type(self), (self.message, self.offset)
+
+
+@dataclass
+class Block:
+    offset: int  # archive offset of the block header
+    raw_len: int
+    crc: int
+    flags: int
+    payload: bytes
+
+    def require(self, supported: int) -> None:
+        """Raise ``ValueError`` if the block sets flags outside *supported*."""
+        unknown = self.flags & ~supported
+        if unknown:
+            raise ValueError(
+                f"Unsupported block flags 0x{unknown:02x} (block at offset "
+                f"{self.offset}); the archive needs a newer text-compressor"
+            )
+
+    def check(self, raw: bytes) -> None:
+        """Raise :class:`CorruptArchiveError` unless *raw* matches the header."""
+        if len(raw) != self.raw_len or zlib.crc32(raw) != self.crc:
+            raise CorruptArchiveError("CRC mismatch – corrupted archive", self.offset)
+
+
+def split_blocks(data: bytes, size: int = BLOCK_SIZE) -> Iterator[bytes]:
+    """Yield consecutive chunks of *data* of roughly *size* bytes.
+
+    Chunks end on a newline whenever the current line fits in the block, which
+    keeps text lines intact inside a single block; otherwise they end on a
+    UTF‑8 character boundary, so every chunk of valid text decodes alone."""
+    start = 0
+    n = len(data)
+    while start < n:
+        end = start + size
+        if end < n:
+            nl = data.rfind(b"\n", start, end)
+            if nl != -1:
+                end = nl + 1
+            else:
+                while end > start + 1 and data[end] & 0xC0 == 0x80:
+                    end -= 1  # don't split a multi‑byte sequence
+        yield data[start:end]
+        start = end
+
+
+def write_block(out: BinaryIO, raw: bytes, payload: bytes, flags: int = 0) -> int:
+    """Write one framed block to *out* and return the number of bytes written.
+
+    ``FLAG_LINE_END`` is derived from *raw*; other *flags* are passed through."""
+    if raw.endswith(b"\n"):
+        flags |= FLAG_LINE_END
+    out.write(len(raw).to_bytes(4, "big"))
+    out.write(len(payload).to_bytes(4, "big"))
+    out.write(zlib.crc32(raw).to_bytes(4, "little"))
+    out.write(flags.to_bytes(1, "big"))
+    out.write(payload)
+    return BLOCK_HEADER_SIZE + len(payload)
+
+
+def iter_blocks(
+    f: BinaryIO, offset: int, supported: int = FLAG_LINE_END
+) -> Iterator[Block]:
+    """Yield the blocks of an archive whose first block starts at *offset*.
+
+    *f* must already be positioned at *offset*.  Truncated headers or payloads
+    raise :class:`CorruptArchiveError`; flags outside *supported* raise
+    ``ValueError``."""
+    while True:
+        header = f.read(BLOCK_HEADER_SIZE)
+        if not header:
+            return
+        if len(header) != BLOCK_HEADER_SIZE:
+            raise CorruptArchiveError("Truncated block header", offset)
+        raw_len = int.from_bytes(header[0:4], "big")
+        payload_len = int.from_bytes(header[4:8], "big")
+        crc = int.from_bytes(header[8:12], "little")
+        flags = header[12]
+        payload = f.read(payload_len)
+        if len(payload) != payload_len:
+            raise CorruptArchiveError("Truncated block payload", offset)
+        block = Block(offset, raw_len, crc, flags, payload)
+        block.require(supported)
+        yield block
+        offset += BLOCK_HEADER_SIZE + payload_len
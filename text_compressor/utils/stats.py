@@ -16,6 +16,7 @@ class Stats:
     comp_size: int
     ratio: float
     time_sec: float
+    cache_hit: bool = False  # output was served from a ResultCache
 
 
 class Timer: